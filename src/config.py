@@ -1,63 +1,126 @@
 """Configuration management for torrent cleaner."""
 
+import functools
 import os
+import re
 from pathlib import Path
 from datetime import timedelta
-from typing import List, Set
+from typing import Dict, List, Set
 from dotenv import load_dotenv
 from src.models import DeletionRule
 
 
+# Duration format: integer followed by d (days), m (months = 30d) or y (years = 365d)
+_DURATION_RE = re.compile(r'([0-9]+)([dmy])', re.IGNORECASE)
+_DURATION_DAYS = {'d': 1, 'm': 30, 'y': 365}
+
+# One token of a DELETION_CRITERIA rule: a duration, a plain ratio, or anything else
+_RULE_TOKEN_RE = re.compile(
+    r'(?P<duration>[0-9]+[dmy])(?!\S)|(?P<ratio>[0-9]*\.?[0-9]+)(?!\S)|(?P<other>\S+)',
+    re.IGNORECASE,
+)
+
+# Values accepted as "true" for boolean environment variables
+_TRUTHY = frozenset(('true', '1', 'yes'))
+
+# Default directories, built once rather than on every Config()
+_DEFAULT_TORRENT_DIR = Path('/data/torrents')
+_DEFAULT_MEDIA_LIBRARY_DIR = Path('/data/media')
+_DEFAULT_DATA_DIR = Path('/app/data/torrent-cleaner')
+
+
+def _env_path(env: Dict[str, str], key: str, default: Path) -> Path:
+    """Return env[key] as a Path, or the shared default Path if unset."""
+    value = env.get(key)
+    return Path(value) if value is not None else default
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    """Load the .env file into the environment, at most once per process."""
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_duration_cached(duration_str: str) -> timedelta:
+    """Memoized implementation of Config.parse_duration (timedelta is immutable)."""
+    duration_str = duration_str.strip()
+
+    # Fast path for the plain form (e.g. "30d")
+    match = _DURATION_RE.fullmatch(duration_str)
+    if match:
+        return timedelta(days=int(match.group(1)) * _DURATION_DAYS[match.group(2).lower()])
+
+    # Anything else goes through int(), which also accepts a sign (e.g. "+30d", "-0d")
+    if not duration_str:
+        raise ValueError("Duration string is empty")
+
+    unit = duration_str[-1].lower()
+    if unit not in _DURATION_DAYS:
+        raise ValueError(f"Invalid duration unit. Use 'd' (days), 'm' (months), or 'y' (years): {duration_str}")
+
+    try:
+        value = int(duration_str[:-1])
+    except ValueError:
+        raise ValueError(f"Invalid duration value: {duration_str}")
+
+    if value < 0:
+        raise ValueError(f"Duration value must be positive: {duration_str}")
+
+    return timedelta(days=value * _DURATION_DAYS[unit])
+
+
 class Config:
     """Application configuration loaded from environment variables."""
 
     def __init__(self):
         """Load and validate configuration from environment."""
-        load_dotenv()
+        _load_env_once()
+        env = dict(os.environ)
 
-        self.qbt_host = self._get_required('QBITTORRENT_HOST')
+        self.qbt_host = self._get_required(env, 'QBITTORRENT_HOST')
         try:
-            self.qbt_port = int(os.getenv('QBITTORRENT_PORT', '8080'))
+            self.qbt_port = int(env.get('QBITTORRENT_PORT', '8080'))
         except ValueError:
-            raise ValueError(f"QBITTORRENT_PORT must be an integer, got: '{os.getenv('QBITTORRENT_PORT')}'")
-        self.qbt_username = self._get_required('QBITTORRENT_USERNAME')
-        self.qbt_password = self._get_required('QBITTORRENT_PASSWORD')
+            raise ValueError(f"QBITTORRENT_PORT must be an integer, got: '{env.get('QBITTORRENT_PORT')}'")
+        self.qbt_username = self._get_required(env, 'QBITTORRENT_USERNAME')
+        self.qbt_password = self._get_required(env, 'QBITTORRENT_PASSWORD')
 
-        self.torrent_dir = Path(os.getenv('TORRENT_DIR', '/data/torrents'))
-        self.media_library_dir = Path(os.getenv('MEDIA_LIBRARY_DIR', '/data/media'))
+        self.torrent_dir = _env_path(env, 'TORRENT_DIR', _DEFAULT_TORRENT_DIR)
+        self.media_library_dir = _env_path(env, 'MEDIA_LIBRARY_DIR', _DEFAULT_MEDIA_LIBRARY_DIR)
 
         self.deletion_rules = self._parse_deletion_criteria(
-            os.getenv('DELETION_CRITERIA', '30d 2.0')
+            env.get('DELETION_CRITERIA', '30d 2.0')
         )
 
-        self.dry_run = os.getenv('DRY_RUN', 'true').lower() in ('true', '1', 'yes')
-        self.fix_hardlinks = os.getenv('FIX_HARDLINKS', 'true').lower() in ('true', '1', 'yes')
+        self.dry_run = env.get('DRY_RUN', 'true').strip().lower() in _TRUTHY
+        self.fix_hardlinks = env.get('FIX_HARDLINKS', 'true').strip().lower() in _TRUTHY
 
         # Data directory base path (used for cache and logs)
-        self.data_dir = Path(os.getenv('DATA_DIR', '/app/data/torrent-cleaner'))
+        self.data_dir = _env_path(env, 'DATA_DIR', _DEFAULT_DATA_DIR)
 
         # File hash cache settings
-        self.enable_cache = os.getenv('ENABLE_CACHE', 'true').lower() in ('true', '1', 'yes')
-        self.cache_db_path = os.getenv('CACHE_DB_PATH', None)  # None = use default location
+        self.enable_cache = env.get('ENABLE_CACHE', 'true').strip().lower() in _TRUTHY
+        self.cache_db_path = env.get('CACHE_DB_PATH', None)  # None = use default location
 
-        self.discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL', '')
+        self.discord_webhook_url = env.get('DISCORD_WEBHOOK_URL', '')
 
         # Dead tracker cleanup
-        self.delete_dead_trackers = os.getenv('DELETE_DEAD_TRACKERS', 'false').lower() in ('true', '1', 'yes')
-        dead_msg_raw = os.getenv('DEAD_TRACKER_MESSAGES', '')
+        self.delete_dead_trackers = env.get('DELETE_DEAD_TRACKERS', 'false').strip().lower() in _TRUTHY
+        dead_msg_raw = env.get('DEAD_TRACKER_MESSAGES', '')
         self.dead_tracker_messages = [m.strip() for m in dead_msg_raw.split('|') if m.strip()]
 
         self.media_extensions = self._parse_media_extensions(
-            os.getenv('MEDIA_EXTENSIONS', '.mkv,.mp4,.avi,.mov,.m4v,.wmv,.flv,.webm,.ts,.m2ts')
+            env.get('MEDIA_EXTENSIONS', '.mkv,.mp4,.avi,.mov,.m4v,.wmv,.flv,.webm,.ts,.m2ts')
         )
 
-        self.log_level = os.getenv('LOG_LEVEL', 'INFO')
-        self.log_file = os.getenv('LOG_FILE', str(self.data_dir / 'logs' / 'cleaner.log'))
+        self.log_level = env.get('LOG_LEVEL', 'INFO')
+        self.log_file = env.get('LOG_FILE', str(self.data_dir / 'logs' / 'cleaner.log'))
 
         try:
-            self.log_max_files = int(os.getenv('LOG_MAX_FILES', '5'))
+            self.log_max_files = int(env.get('LOG_MAX_FILES', '5'))
         except ValueError:
-            raise ValueError(f"LOG_MAX_FILES must be an integer, got: '{os.getenv('LOG_MAX_FILES')}'")
+            raise ValueError(f"LOG_MAX_FILES must be an integer, got: '{env.get('LOG_MAX_FILES')}'")
         if self.log_max_files < 0:
             raise ValueError(f"LOG_MAX_FILES must be >= 0, got: {self.log_max_files}")
 
@@ -78,9 +141,10 @@ class Config:
             raise ValueError("MEDIA_EXTENSIONS must contain at least one extension")
         return extensions
 
-    def _get_required(self, key: str) -> str:
+    @staticmethod
+    def _get_required(env: Dict[str, str], key: str) -> str:
         """Get required environment variable or raise error."""
-        value = os.getenv(key)
+        value = env.get(key)
         if not value:
             raise ValueError(f"Required environment variable not set: {key}")
         return value
@@ -104,22 +168,21 @@ class Config:
             if not rule_str:
                 raise ValueError("DELETION_CRITERIA contains an empty rule (double pipe or trailing pipe)")
 
-            tokens = rule_str.split()
             rule = DeletionRule()
 
-            for token in tokens:
-                token_lower = token.strip().lower()
-                if not token_lower:
-                    continue
+            for match in _RULE_TOKEN_RE.finditer(rule_str):
+                token = match.group()
+                kind = match.lastgroup
+                if kind == 'other':
+                    # Not a plain duration/ratio - classify as before so errors stay specific
+                    kind = 'duration' if token[-1].lower() in _DURATION_DAYS else 'ratio'
 
-                # Check if it's a duration (ends with d/m/y)
-                if token_lower[-1] in ('d', 'm', 'y'):
+                if kind == 'duration':
                     if rule.min_duration is not None:
                         raise ValueError(f"Duplicate duration in rule '{rule_str}': already have '{rule.min_duration}', got '{token}'")
-                    Config.parse_duration(token)
-                    rule.min_duration = token.strip()
+                    rule.min_duration_delta = Config.parse_duration(token)
+                    rule.min_duration = token
                 else:
-                    # Must be a ratio
                     try:
                         ratio = float(token)
                     except ValueError:
@@ -133,6 +196,7 @@ class Config:
             if rule.min_duration is None and rule.min_ratio is None:
                 raise ValueError(f"Rule '{rule_str}' has no valid conditions")
 
+            rule.label = rule.format_label()
             rules.append(rule)
 
         if not rules:
@@ -140,16 +204,23 @@ class Config:
 
         return rules
 
-    def _validate(self):
-        """Validate configuration values."""
-        if not self.torrent_dir.exists():
-            raise ValueError(f"Torrent directory does not exist: {self.torrent_dir}")
+    @staticmethod
+    def _check_dir(path: Path, label: str, writable: bool) -> None:
+        """Check that a directory exists (and is writable) with a single access() call.
 
-        if not self.media_library_dir.exists():
-            raise ValueError(f"Media library directory does not exist: {self.media_library_dir}")
+        W_OK implies existence, so the follow-up exists() only runs on failure
+        to pick the right error message.
+        """
+        if os.access(path, os.W_OK if writable else os.F_OK):
+            return
+        if not path.exists():
+            raise ValueError(f"{label} directory does not exist: {path}")
+        raise ValueError(f"{label} directory is not writable: {path}")
 
-        if not self.dry_run and not os.access(self.torrent_dir, os.W_OK):
-            raise ValueError(f"Torrent directory is not writable: {self.torrent_dir}")
+    def _validate(self):
+        """Validate configuration values."""
+        self._check_dir(self.torrent_dir, 'Torrent', writable=not self.dry_run)
+        self._check_dir(self.media_library_dir, 'Media library', writable=False)
 
         try:
             self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -158,7 +229,7 @@ class Config:
         if not os.access(self.data_dir, os.W_OK):
             raise ValueError(f"Data directory is not writable: {self.data_dir}")
 
-        if self.cache_db_path:
+        if self.enable_cache and self.cache_db_path:
             cache_parent = Path(self.cache_db_path).parent
             try:
                 cache_parent.mkdir(parents=True, exist_ok=True)
@@ -179,32 +250,7 @@ class Config:
         Raises:
             ValueError: If format is invalid
         """
-        duration_str = duration_str.strip().lower()
-
-        if not duration_str:
-            raise ValueError("Duration string is empty")
-
-        if duration_str[-1] not in ('d', 'm', 'y'):
-            raise ValueError(f"Invalid duration unit. Use 'd' (days), 'm' (months), or 'y' (years): {duration_str}")
-
-        try:
-            value = int(duration_str[:-1])
-        except ValueError:
-            raise ValueError(f"Invalid duration value: {duration_str}")
-
-        unit = duration_str[-1]
-
-        if value < 0:
-            raise ValueError(f"Duration value must be positive: {duration_str}")
-
-        if unit == 'd':
-            days = value
-        elif unit == 'm':
-            days = value * 30  # Approximate month as 30 days
-        elif unit == 'y':
-            days = value * 365  # Approximate year as 365 days
-
-        return timedelta(days=days)
+        return _parse_duration_cached(duration_str)
 
     @staticmethod
     def format_deletion_rules(rules: List[DeletionRule]) -> str:
@@ -221,6 +267,11 @@ class Config:
 
     def __str__(self) -> str:
         """Return string representation of config."""
+        return self._str
+
+    @functools.cached_property
+    def _str(self) -> str:
+        """String representation, built on first use (Config isn't changed after load)."""
         return (
             f"Config(\n"
             f"  qbt_host={self.qbt_host}:{self.qbt_port}\n"
@@ -1,13 +1,36 @@
 """Discord webhook notifications."""
 
-import requests
+import functools
+import json
 import logging
+import random
+import time
+from itertools import islice
 from typing import Dict, List
 from datetime import datetime, timezone
 
 from src.models import HardlinkFailure, WorkflowStats
 
 
+BYTES_PER_GB = 1024 ** 3
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Static embed parts, built once and shared (embeds are serialized, never mutated)
+_FOOTER = {'text': 'Torrent Cleaner'}
+_SUMMARY_TITLES = {
+    True: "[DRY RUN] Torrent Cleaner Summary",
+    False: "Torrent Cleaner Summary",
+}
+
+# 429 handling: attempts after the first, and the cap on a single wait (seconds)
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_MAX_DELAY = 60.0
+
+# Discord limit on the combined text of all embeds in one message
+_MAX_MESSAGE_EMBED_CHARS = 6000
+
+
 class DiscordNotifier:
     """Send notifications to Discord via webhook."""
 
@@ -25,6 +48,100 @@ class DiscordNotifier:
         if not self.enabled:
             self.logger.info("Discord notifications disabled (no webhook URL)")
 
+        # Monotonic time when Discord's rate-limit bucket refills, if we emptied it
+        self._bucket_reset_at = 0.0
+
+    @functools.cached_property
+    def _session(self):
+        """Keep-alive HTTP session shared by all webhook calls in a run.
+
+        requests is imported here rather than at module level so runs without
+        a webhook never pay its import cost.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        # Only connection failures are retried: the request never reached Discord then.
+        # A 5xx or read error can follow a message that was already posted, so retrying
+        # those could post it twice. 429 is handled in _post().
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.3,
+        )
+        # Single webhook host, so one small pool is enough
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+        return session
+
+    def _post(self, payload: Dict) -> None:
+        """POST a JSON payload to the webhook, raising on HTTP errors."""
+        data = json.dumps(payload, separators=(',', ':'), allow_nan=False).encode('utf-8')
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            wait = self._bucket_reset_at - time.monotonic()
+            if wait > 0:
+                self.logger.debug("Discord rate-limit bucket empty, waiting %.1fs", wait)
+                time.sleep(min(wait, _RATE_LIMIT_MAX_DELAY))
+
+            response = self._session.post(
+                self.webhook_url,
+                data=data,
+                headers=_JSON_HEADERS,
+                timeout=10
+            )
+            self._track_bucket(response)
+            if response.status_code != 429 or attempt == _RATE_LIMIT_RETRIES:
+                break
+
+            retry_after = self._retry_after_seconds(response)
+            delay = min(retry_after * (2 ** attempt) + random.uniform(0, 1), _RATE_LIMIT_MAX_DELAY)
+            self.logger.warning(
+                f"Discord rate limit hit (retry_after={retry_after}s), "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{_RATE_LIMIT_RETRIES})"
+            )
+            time.sleep(delay)
+
+        response.raise_for_status()
+
+    def _track_bucket(self, response) -> None:
+        """Remember when to send next if this response used up the rate-limit bucket."""
+        if response.headers.get('X-RateLimit-Remaining') != '0':
+            return
+        try:
+            reset_after = float(response.headers['X-RateLimit-Reset-After'])
+        except (KeyError, ValueError):
+            return
+        self._bucket_reset_at = time.monotonic() + reset_after
+
+    @staticmethod
+    def _retry_after_seconds(response) -> float:
+        """Read the rate-limit wait from a 429 response (JSON body, then header)."""
+        try:
+            return float(response.json()['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return 1.0
+
+    def close(self):
+        """Close the underlying HTTP session, if one was opened."""
+        if '_session' in self.__dict__:
+            self._session.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
     def send_summary(self, summary: WorkflowStats, dry_run: bool = True) -> bool:
         """
         Send run summary to Discord.
@@ -40,19 +157,12 @@ class DiscordNotifier:
             self.logger.debug("Discord notifications disabled, skipping")
             return True
 
+        import requests
+
         try:
             embed = self._build_summary_embed(summary, dry_run)
 
-            payload = {
-                'embeds': [embed]
-            }
-
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._post({'embeds': [embed]})
 
             self.logger.info("Discord notification sent successfully")
             return True
@@ -64,6 +174,54 @@ class DiscordNotifier:
             self.logger.error(f"Unexpected error sending Discord notification: {e}")
             return False
 
+    def send_run_report(self, summary: WorkflowStats, dry_run: bool = True) -> bool:
+        """
+        Send the run summary and any hardlink failures to Discord.
+
+        Both embeds go out in a single webhook message when they fit within
+        Discord's per-message size limit; otherwise they are sent separately.
+
+        Args:
+            summary: WorkflowStats with run statistics
+            dry_run: Whether this was a dry run
+
+        Returns:
+            True if all notifications sent successfully
+        """
+        if not summary.hardlink_failures:
+            return self.send_summary(summary, dry_run)
+
+        if not self.enabled:
+            return True
+
+        try:
+            embeds = [
+                self._build_summary_embed(summary, dry_run),
+                self._build_hardlink_failures_embed(summary.hardlink_failures),
+            ]
+            if sum(self._embed_length(embed) for embed in embeds) > _MAX_MESSAGE_EMBED_CHARS:
+                summary_sent = self.send_summary(summary, dry_run)
+                failures_sent = self.send_hardlink_failures(summary.hardlink_failures)
+                return summary_sent and failures_sent
+
+            self._post({'embeds': embeds})
+
+            self.logger.info("Discord summary and hardlink failure notification sent successfully")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to send Discord run report: {e}")
+            return False
+
+    @staticmethod
+    def _embed_length(embed: Dict) -> int:
+        """Count the characters Discord includes in its per-message embed limit."""
+        length = len(embed.get('title', '')) + len(embed.get('description', ''))
+        length += len(embed.get('footer', {}).get('text', ''))
+        for f in embed.get('fields', ()):
+            length += len(f['name']) + len(f['value'])
+        return length
+
     def _build_summary_embed(self, summary: WorkflowStats, dry_run: bool) -> Dict:
         """
         Build Discord embed for run summary.
@@ -75,92 +233,73 @@ class DiscordNotifier:
         Returns:
             Discord embed dictionary
         """
-        if summary.torrents_deleted == 0:
+        # Bind fields read more than once to locals
+        torrents_deleted = summary.torrents_deleted
+        hardlink_failures = summary.hardlink_failures
+        deleted_torrents = summary.deleted_torrents
+
+        if torrents_deleted == 0:
             color = 0x00FF00  # Green
         elif dry_run:
             color = 0xFFFF00  # Yellow
         else:
             color = 0xFF0000  # Red
 
-        mode = "[DRY RUN] " if dry_run else ""
-        title = f"{mode}Torrent Cleaner Summary"
+        title = _SUMMARY_TITLES[dry_run]
+
+        # Single clock read so the description and timestamp agree
+        now = datetime.now(timezone.utc)
+        description = f"Run completed at {now.astimezone().strftime('%Y-%m-%d %H:%M:%S')}"
 
-        description = f"Run completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        dead_tracker_gb = summary.space_freed_dead_tracker_bytes / BYTES_PER_GB
+        criteria_gb = summary.space_freed_criteria_bytes / BYTES_PER_GB
+        hardlinks_gb = summary.space_saved_hardlinks_bytes / BYTES_PER_GB
+        total_gb = dead_tracker_gb + criteria_gb + hardlinks_gb
 
         fields = [
-            {
-                'name': 'Torrents Processed',
-                'value': str(summary.torrents_processed),
-                'inline': True
-            },
-            {
-                'name': 'Torrents Deleted',
-                'value': str(summary.torrents_deleted),
-                'inline': True
-            },
-            {
-                'name': 'Torrents Kept',
-                'value': str(summary.torrents_kept),
-                'inline': True
-            },
+            {'name': 'Torrents Processed', 'value': str(summary.torrents_processed), 'inline': True},
+            {'name': 'Torrents Deleted', 'value': str(torrents_deleted), 'inline': True},
+            {'name': 'Torrents Kept', 'value': str(summary.torrents_kept), 'inline': True},
         ]
+        add_field = fields.append
 
         if summary.hardlinks_fixed > 0 or summary.hardlinks_attempted > 0:
-            fields.extend([
-                {
-                    'name': 'Hardlinks Fixed',
-                    'value': str(summary.hardlinks_fixed),
-                    'inline': True
-                },
-                {
-                    'name': 'Hardlinks Failed',
-                    'value': str(summary.hardlinks_failed),
-                    'inline': True
-                },
-            ])
-
-        if summary.hardlink_failures:
-            fields.append({
+            add_field({'name': 'Hardlinks Fixed', 'value': str(summary.hardlinks_fixed), 'inline': True})
+            add_field({'name': 'Hardlinks Failed', 'value': str(summary.hardlinks_failed), 'inline': True})
+
+        if hardlink_failures:
+            add_field({
                 'name': 'Hardlink Failures',
-                'value': f"{len(summary.hardlink_failures)} file(s) require manual intervention",
+                'value': f"{len(hardlink_failures)} file(s) require manual intervention",
                 'inline': True
             })
 
-        fields.extend([
-            {
-                'name': 'Orphaned Files Found',
-                'value': str(summary.orphaned_files_found),
-                'inline': True
-            },
-        ])
+        add_field({'name': 'Orphaned Files Found', 'value': str(summary.orphaned_files_found), 'inline': True})
 
-        space_freed_gb = (summary.space_freed_dead_tracker_bytes + summary.space_freed_criteria_bytes) / (1024**3)
-        space_hardlinks_gb = summary.space_saved_hardlinks_bytes / (1024**3)
-        space_total_gb = space_freed_gb + space_hardlinks_gb
-        if space_total_gb > 0:
+        if total_gb > 0:
             space_parts = []
-            if summary.space_freed_dead_tracker_bytes > 0:
-                space_parts.append(f"Dead trackers: {summary.space_freed_dead_tracker_bytes / (1024**3):.2f} GB")
-            if summary.space_freed_criteria_bytes > 0:
-                space_parts.append(f"Criteria: {summary.space_freed_criteria_bytes / (1024**3):.2f} GB")
-            if space_hardlinks_gb > 0:
-                space_parts.append(f"Hardlinks: {space_hardlinks_gb:.2f} GB")
-            space_value = f"{space_total_gb:.2f} GB"
+            if dead_tracker_gb > 0:
+                space_parts.append(f"Dead trackers: {dead_tracker_gb:.2f} GB")
+            if criteria_gb > 0:
+                space_parts.append(f"Criteria: {criteria_gb:.2f} GB")
+            if hardlinks_gb > 0:
+                space_parts.append(f"Hardlinks: {hardlinks_gb:.2f} GB")
+            space_value = f"{total_gb:.2f} GB"
             if len(space_parts) > 1:
                 space_value += f"\n({', '.join(space_parts)})"
-            fields.append({
+            add_field({
                 'name': 'Space Saved',
                 'value': space_value,
                 'inline': True
             })
 
-        if summary.deleted_torrents:
-            torrents_list = summary.deleted_torrents[:5]
-            torrents_text = '\n'.join([f"• {t}" for t in torrents_list])
-            if len(summary.deleted_torrents) > 5:
-                torrents_text += f"\n... and {len(summary.deleted_torrents) - 5} more"
+        if deleted_torrents:
+            deleted_count = len(deleted_torrents)
+            torrents_text = '\n'.join(f"• {t}" for t in islice(deleted_torrents, 5))
+            if deleted_count > 5:
+                torrents_text += f"\n... and {deleted_count - 5} more"
 
-            fields.append({
+            add_field({
                 'name': 'Deleted Torrents',
                 'value': torrents_text,
                 'inline': False
@@ -171,10 +310,41 @@ class DiscordNotifier:
             'description': description,
             'color': color,
             'fields': fields,
+            'timestamp': now.isoformat(),
+            'footer': _FOOTER,
+        }
+
+        return embed
+
+    def _build_hardlink_failures_embed(self, failures: List[HardlinkFailure]) -> Dict:
+        """
+        Build Discord embed listing hardlink failures.
+
+        Args:
+            failures: List of HardlinkFailure objects
+
+        Returns:
+            Discord embed dictionary
+        """
+        lines = []
+        for f in failures:
+            lines.append(f"**{f.torrent}**")
+            lines.append(f"  File: `{f.file}`")
+            lines.append(f"  Media: `{f.media_file}`")
+            lines.append(f"  Error: {f.action.value} - {f.message}")
+            lines.append("")
+
+        description = '\n'.join(lines)
+        # Discord embed description limit is 4096 chars
+        if len(description) > 4000:
+            description = description[:3950] + f"\n\n... and more ({len(failures)} total failures)"
+
+        embed = {
+            'title': 'Hardlink Failures - Manual Fix Required',
+            'description': description,
+            'color': 0xFF9900,  # Orange - warning
             'timestamp': datetime.now(timezone.utc).isoformat(),
-            'footer': {
-                'text': 'Torrent Cleaner'
-            }
+            'footer': _FOOTER,
         }
 
         return embed
@@ -193,37 +363,9 @@ class DiscordNotifier:
             return True
 
         try:
-            lines = []
-            for f in failures:
-                lines.append(f"**{f.torrent}**")
-                lines.append(f"  File: `{f.file}`")
-                lines.append(f"  Media: `{f.media_file}`")
-                lines.append(f"  Error: {f.action.value} - {f.message}")
-                lines.append("")
-
-            description = '\n'.join(lines)
-            # Discord embed description limit is 4096 chars
-            if len(description) > 4000:
-                description = description[:3950] + f"\n\n... and more ({len(failures)} total failures)"
-
-            embed = {
-                'title': 'Hardlink Failures - Manual Fix Required',
-                'description': description,
-                'color': 0xFF9900,  # Orange - warning
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'footer': {
-                    'text': 'Torrent Cleaner'
-                }
-            }
-
-            payload = {'embeds': [embed]}
+            embed = self._build_hardlink_failures_embed(failures)
 
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._post({'embeds': [embed]})
 
             self.logger.info("Discord hardlink failure notification sent successfully")
             return True
@@ -253,14 +395,7 @@ class DiscordNotifier:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
 
-            payload = {'embeds': [embed]}
-
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
+            self._post({'embeds': [embed]})
 
             self.logger.info("Discord error notification sent successfully")
             return True
@@ -1,11 +1,13 @@
 """File analysis for hardlink detection and hash comparison."""
 
 import os
+import stat
 from pathlib import Path
-from typing import List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import logging
 
-from src.utils.hash_utils import hash_file
+from src.utils.hash_utils import hash_file, hash_sample
 from src.models import CacheStats, OrphanDetectionResult, OrphanDetectionStats, SizeIndex
 
 
@@ -15,6 +17,16 @@ class FileAnalyzer:
     # Media file extensions to prioritize
     MEDIA_EXTENSIONS = {'.mkv', '.mp4', '.avi', '.mov', '.m4v', '.wmv', '.flv', '.webm', '.ts', '.m2ts'}
 
+    # Worker threads used to stat files while building the size index
+    INDEX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+    # Bytes read from each end of a file for the pre-hash fingerprint
+    SAMPLE_SIZE = 64 * 1024
+
+    # Worker threads used to hash files in find_identical_files. xxhash releases the GIL,
+    # so threads use several cores when files are cached; capped since cold reads are disk-bound.
+    HASH_WORKERS = min(8, os.cpu_count() or 1)
+
     def __init__(self, cache=None, media_extensions: Set[str] = None):
         """Initialize file analyzer.
 
@@ -26,32 +38,52 @@ class FileAnalyzer:
         self.logger = logging.getLogger(__name__)
         self.cache = cache
         self.media_extensions = media_extensions if media_extensions is not None else self.MEDIA_EXTENSIONS
+        self._media_ext = frozenset(self.media_extensions)
         self._cache_hits = 0
         self._cache_misses = 0
         self._size_index: SizeIndex = SizeIndex()
 
-    def _hash_file_with_cache(self, file_path: str) -> str:
+    def _hash_file_with_cache(self, file_path: str, file_stat: os.stat_result | None = None) -> str:
         """Hash a file, using cache if available.
 
         Args:
             file_path: Path to file
+            file_stat: Optional stat result for file_path, saves the cache a stat() call
 
         Returns:
             Hash string
         """
         if self.cache:
-            cached = self.cache.get_cached_hash(file_path)
+            if file_stat is None:
+                file_stat = os.stat(file_path)
+            size, mtime = file_stat.st_size, file_stat.st_mtime
+
+            cached = self.cache.get_cached_hash(file_path, size=size, mtime=mtime)
             if cached is not None:
                 self._cache_hits += 1
                 return cached
 
             self._cache_misses += 1
             file_hash = hash_file(file_path)
-            self.cache.store_hash(file_path, file_hash)
+            self.cache.store_hash(file_path, file_hash, size=size, mtime=mtime)
             return file_hash
 
         return hash_file(file_path)
 
+    def _cached_hashes(self, file_stats: Dict[str, os.stat_result]) -> Dict[str, str]:
+        """Return valid cached hashes for the given paths in one batch (empty without a cache)."""
+        if not self.cache:
+            return {}
+        return self.cache.get_cached_hashes(file_stats, stats=file_stats)
+
+    def _known_or_hash(self, file_path: str, file_stat: os.stat_result, cached: Dict[str, str]) -> str:
+        """Return file_path's hash from an earlier cache lookup, hashing it if it wasn't there."""
+        file_hash = cached.get(file_path)
+        if file_hash is not None:
+            self._cache_hits += 1
+            return file_hash
+        return self._hash_file_with_cache(file_path, file_stat)
+
     def get_hardlink_count(self, file_path: str) -> int:
         """
         Get number of hardlinks for a file.
@@ -68,12 +100,18 @@ class FileAnalyzer:
             self.logger.error(f"Failed to get hardlink count for {file_path}: {e}")
             return 0
 
-    def detect_orphaned_files(self, torrent_files: List[str]) -> OrphanDetectionResult:
+    def detect_orphaned_files(
+        self,
+        torrent_files: List[str],
+        stat_cache: Optional[Dict[str, Optional[os.stat_result]]] = None,
+    ) -> OrphanDetectionResult:
         """
         Detect orphaned files (hardlink count = 1) in torrent file list.
 
         Args:
             torrent_files: List of absolute file paths
+            stat_cache: Optional stat results already taken for these paths
+                        (None marks a missing file). Paths not in it are stat'ed.
 
         Returns:
             OrphanDetectionResult with orphaned files, linked files, and stats
@@ -84,25 +122,31 @@ class FileAnalyzer:
 
         for file_path in torrent_files:
             try:
-                path = Path(file_path)
-
-                if not path.exists():
+                # One stat() covers existence, file type and link count
+                try:
+                    if stat_cache is not None and file_path in stat_cache:
+                        file_stat = stat_cache[file_path]
+                        if file_stat is None:
+                            raise FileNotFoundError(file_path)
+                    else:
+                        file_stat = os.stat(file_path)
+                except (FileNotFoundError, NotADirectoryError):
                     self.logger.warning(f"File does not exist: {file_path}")
                     errors.append(file_path)
                     continue
 
-                if not path.is_file():
-                    self.logger.debug(f"Skipping non-file: {file_path}")
+                if not stat.S_ISREG(file_stat.st_mode):
+                    self.logger.debug("Skipping non-file: %s", file_path)
                     continue
 
-                link_count = self.get_hardlink_count(file_path)
+                link_count = file_stat.st_nlink
 
                 if link_count == 1:
                     orphaned.append(file_path)
-                    self.logger.debug(f"Orphaned file (links={link_count}): {file_path}")
+                    self.logger.debug("Orphaned file (links=%s): %s", link_count, file_path)
                 else:
                     linked.append(file_path)
-                    self.logger.debug(f"Linked file (links={link_count}): {file_path}")
+                    self.logger.debug("Linked file (links=%s): %s", link_count, file_path)
 
             except (OSError, PermissionError) as e:
                 self.logger.error(f"Error checking file {file_path}: {e}")
@@ -115,7 +159,7 @@ class FileAnalyzer:
             errors=len(errors)
         )
 
-        self.logger.debug(f"File analysis: total={stats.total}, orphaned={stats.orphaned}, linked={stats.linked}, errors={stats.errors}")
+        self.logger.debug("File analysis: total=%s, orphaned=%s, linked=%s, errors=%s", stats.total, stats.orphaned, stats.linked, stats.errors)
 
         return OrphanDetectionResult(
             orphaned=orphaned,
@@ -123,7 +167,12 @@ class FileAnalyzer:
             stats=stats
         )
 
-    def build_size_index(self, media_dir: Path, extensions: Set[str] | None = None) -> SizeIndex:
+    def build_size_index(
+        self,
+        media_dir: Path,
+        extensions: Set[str] | None = None,
+        sizes: Set[int] | None = None,
+    ) -> SizeIndex:
         """
         Build size-based index of all files in media library.
 
@@ -131,6 +180,9 @@ class FileAnalyzer:
             media_dir: Root directory of media library
             extensions: Optional set of file extensions to index.
                        If None, indexes all files.
+            sizes: Optional set of file sizes to keep. Files of any other size
+                   can never match, so leaving them out keeps the index small.
+                   If None, indexes files of every size.
 
         Returns:
             SizeIndex mapping file sizes to lists of file paths
@@ -144,28 +196,86 @@ class FileAnalyzer:
         file_count = 0
         error_count = 0
 
-        for dirpath, _dirnames, filenames in os.walk(media_dir):
-            for filename in filenames:
-                if extensions and os.path.splitext(filename)[1].lower() not in extensions:
-                    continue
-
-                file_path = os.path.join(dirpath, filename)
-                try:
-                    size = os.stat(file_path).st_size
-                    size_index.add(size, file_path)
-                    file_count += 1
-
-                    if file_count % 1000 == 0:
-                        self.logger.info(f"Indexed {file_count} files...")
-
-                except (OSError, PermissionError) as e:
-                    self.logger.error(f"Error indexing file {file_path}: {e}")
-                    error_count += 1
+        # Stat each directory's files on a worker thread so several stat() calls are
+        # in flight at once (helps on network filesystems). map() keeps walk order,
+        # so the index is identical to a sequential build.
+        with ThreadPoolExecutor(max_workers=self.INDEX_WORKERS) as executor:
+            batches = executor.map(
+                lambda entries: self._stat_entries(entries, extensions),
+                self._scan_tree(str(media_dir)),
+            )
+            for entries, errors in batches:
+                previous_count = file_count
+                for size, file_path, inode in entries:
+                    if sizes is None or size in sizes:
+                        size_index.add(size, file_path, inode)
+                file_count += len(entries)
+                error_count += errors
+
+                if file_count // 1000 > previous_count // 1000:
+                    self.logger.info(f"Indexed {file_count} files...")
 
         self.logger.info(f"Size index built: {file_count} files indexed, {error_count} errors")
         self._size_index = size_index
         return size_index
 
+    def _scan_tree(self, root: str) -> Iterator[List[os.DirEntry]]:
+        """Walk a directory tree with os.scandir, yielding each directory's non-directory entries.
+
+        Traversal order and symlink handling match os.walk() (top-down, symlinked
+        directories are not followed).
+        """
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError as e:
+            self.logger.error(f"Error scanning directory {root}: {e}")
+            return
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                files.append(entry)
+            elif not entry.is_symlink():
+                subdirs.append(entry.path)
+
+        yield files
+        for subdir in subdirs:
+            yield from self._scan_tree(subdir)
+
+    def _stat_entries(
+        self,
+        entries: List[os.DirEntry],
+        extensions: Set[str] | None,
+    ) -> Tuple[List[Tuple[int, str, Tuple[int, int]]], int]:
+        """Stat one directory's files for the size index.
+
+        Returns:
+            Tuple of ((size, path, (dev, inode)) entries, error count)
+        """
+        indexed = []
+        error_count = 0
+        for entry in entries:
+            if extensions:
+                # rfind/slice instead of splitext: only the suffix gets lowercased
+                name = entry.name
+                dot = name.rfind('.')
+                if dot <= 0 or name[dot:].lower() not in extensions:
+                    continue
+
+            try:
+                entry_stat = entry.stat()
+                indexed.append((entry_stat.st_size, entry.path, (entry_stat.st_dev, entry_stat.st_ino)))
+            except (OSError, PermissionError) as e:
+                self.logger.error(f"Error indexing file {entry.path}: {e}")
+                error_count += 1
+        return indexed, error_count
+
     def find_identical_file(
         self,
         orphaned_file: str,
@@ -202,28 +312,36 @@ class FileAnalyzer:
             return None
 
         # Fast path: check if any candidate shares the same inode (hardlinked)
+        candidate_stats = {}
         for candidate in candidates:
             try:
-                if os.stat(candidate).st_ino == file_inode:
-                    self.logger.debug(f"Found hardlinked file for {orphaned_file}: {candidate}")
-                    return candidate
+                candidate_stat = os.stat(candidate)
             except OSError:
                 continue
+            if candidate_stat.st_ino == file_inode:
+                self.logger.debug("Found hardlinked file for %s: %s", orphaned_file, candidate)
+                return candidate
+            candidate_stats[candidate] = candidate_stat
+
+        # Cached full hashes first; head/tail fingerprints then rule out most
+        # uncached non-matches without a full read
+        cached = self._cached_hashes({orphaned_file: file_stat, **candidate_stats})
+        survivors = self._filter_by_sample(orphaned_file, candidate_stats, {}, cached)
+        if not survivors:
+            return None
 
-        # Slow path: hash to find identical content
+        # Slow path: hash to find identical content (reusing the stats from above)
         try:
-            file_hash = self._hash_file_with_cache(str(orphaned_file))
+            file_hash = self._known_or_hash(orphaned_file, file_stat, cached)
         except Exception as e:
             self.logger.error(f"Error hashing file {orphaned_file}: {e}")
             return None
 
-        for candidate in candidates:
+        for candidate in survivors:
             try:
-                if not Path(candidate).exists():
-                    continue
-                candidate_hash = self._hash_file_with_cache(candidate)
+                candidate_hash = self._known_or_hash(candidate, candidate_stats[candidate], cached)
                 if candidate_hash == file_hash:
-                    self.logger.debug(f"Found identical file for {orphaned_file}: {candidate}")
+                    self.logger.debug("Found identical file for %s: %s", orphaned_file, candidate)
                     return candidate
             except Exception as e:
                 self.logger.error(f"Error hashing candidate {candidate}: {e}")
@@ -231,6 +349,215 @@ class FileAnalyzer:
 
         return None
 
+    def find_identical_files(
+        self,
+        orphaned_files: List[str],
+        size_index: SizeIndex | None = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Find identical files in media library for many orphaned files at once.
+
+        Uses the same matching as find_identical_file, but every orphan and
+        candidate is stat'ed and hashed at most once per call, even when several
+        orphans share a size bucket. Cached hashes are fetched in one batch, the
+        rest are hashed on a thread pool and stored in one batch.
+
+        Args:
+            orphaned_files: List of orphaned file paths
+            size_index: Optional SizeIndex (uses self._size_index if not provided)
+
+        Returns:
+            Dict mapping each orphaned file to its identical media file, or None
+        """
+        matches: Dict[str, Optional[str]] = dict.fromkeys(orphaned_files)
+
+        effective_size_index = size_index or self._size_index
+        if not effective_size_index:
+            self.logger.warning("No size index available for find_identical_files")
+            return matches
+
+        candidates_by_size: Dict[int, Dict[str, os.stat_result]] = {}
+        fingerprints: Dict[str, Optional[int]] = {}
+        to_hash: Dict[str, os.stat_result] = {}
+        pending: Dict[str, List[str]] = {}
+        # Orphans with no hardlinked candidate, still to be compared by content
+        unmatched: Dict[str, Tuple[os.stat_result, Dict[str, os.stat_result]]] = {}
+
+        for orphaned_file in orphaned_files:
+            try:
+                file_stat = os.stat(orphaned_file)
+            except OSError as e:
+                self.logger.error(f"Cannot stat file {orphaned_file}: {e}")
+                continue
+
+            file_size = file_stat.st_size
+            candidates = candidates_by_size.get(file_size)
+            if candidates is None:
+                candidates = self._stat_candidates(effective_size_index.get_candidates(file_size))
+                candidates_by_size[file_size] = candidates
+            if not candidates:
+                continue
+
+            # Fast path: a candidate that shares the same inode (hardlinked)
+            for candidate, candidate_stat in candidates.items():
+                if candidate_stat.st_ino == file_stat.st_ino:
+                    self.logger.debug("Found hardlinked file for %s: %s", orphaned_file, candidate)
+                    matches[orphaned_file] = candidate
+                    break
+            else:
+                unmatched[orphaned_file] = (file_stat, candidates)
+
+        if not unmatched:
+            return matches
+
+        # Cached full hashes for everything involved, in one batch
+        involved: Dict[str, os.stat_result] = {}
+        for orphaned_file, (file_stat, candidates) in unmatched.items():
+            involved[orphaned_file] = file_stat
+            involved.update(candidates)
+        cached = self._cached_hashes(involved)
+
+        for orphaned_file, (file_stat, candidates) in unmatched.items():
+            # Head/tail fingerprints rule out most uncached non-matches without a full read
+            survivors = self._filter_by_sample(orphaned_file, candidates, fingerprints, cached)
+            if not survivors:
+                continue
+            pending[orphaned_file] = survivors
+            to_hash[orphaned_file] = file_stat
+            for candidate in survivors:
+                to_hash[candidate] = candidates[candidate]
+
+        if not pending:
+            return matches
+
+        # Slow path: hash everything needed once, then match by hash
+        hashes = self._hash_files(to_hash, cached)
+        for orphaned_file, survivors in pending.items():
+            file_hash = hashes.get(orphaned_file)
+            if file_hash is None:
+                continue
+            for candidate in survivors:
+                if hashes.get(candidate) == file_hash:
+                    self.logger.debug("Found identical file for %s: %s", orphaned_file, candidate)
+                    matches[orphaned_file] = candidate
+                    break
+
+        return matches
+
+    def _filter_by_sample(
+        self,
+        orphaned_file: str,
+        candidates: Iterable[str],
+        fingerprints: Dict[str, Optional[int]],
+        cached: Dict[str, str],
+    ) -> List[str]:
+        """Return the same-size candidates that may be identical to orphaned_file.
+
+        Candidates with a cached full hash are never sampled: they are compared
+        by hash when the orphan's hash is cached too, and kept otherwise. Only
+        the remaining candidates are compared by head/tail fingerprint. A
+        surviving candidate still requires a full hash match. Files that can't
+        be read are kept (fingerprint None) so the hashing path reports them.
+
+        Args:
+            orphaned_file: Path to orphaned file
+            candidates: Candidate paths of the same size
+            fingerprints: Fingerprints computed so far, shared across calls to
+                          read each file at most once
+            cached: Valid cached full hashes by path
+
+        Returns:
+            Candidates that may be identical, in order
+        """
+        def fingerprint(path: str) -> Optional[int]:
+            if path not in fingerprints:
+                try:
+                    fingerprints[path] = hash_sample(path, self.SAMPLE_SIZE)
+                except OSError as e:
+                    self.logger.debug("Could not sample %s: %s", path, e)
+                    fingerprints[path] = None
+            return fingerprints[path]
+
+        candidates = list(candidates)
+        orphan_hash = cached.get(orphaned_file)
+        keep = set()
+        uncached = []
+        for candidate in candidates:
+            candidate_hash = cached.get(candidate)
+            if candidate_hash is None:
+                uncached.append(candidate)
+            elif orphan_hash is None or candidate_hash == orphan_hash:
+                keep.add(candidate)
+
+        if uncached:
+            orphan_fingerprint = fingerprint(orphaned_file)
+            keep.update(
+                candidate for candidate in uncached
+                if orphan_fingerprint is None or fingerprint(candidate) in (orphan_fingerprint, None)
+            )
+        return [candidate for candidate in candidates if candidate in keep]
+
+    @staticmethod
+    def _stat_candidates(candidates: List[str]) -> Dict[str, os.stat_result]:
+        """Stat candidate files, dropping any that can't be stat'ed (order preserved)."""
+        candidate_stats = {}
+        for candidate in candidates:
+            try:
+                candidate_stats[candidate] = os.stat(candidate)
+            except OSError:
+                continue
+        return candidate_stats
+
+    def _hash_files(self, file_stats: Dict[str, os.stat_result], cached: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Hash many files, using batched cache lookups/stores and a thread pool for misses.
+
+        Args:
+            file_stats: Current stat result for each path to hash
+            cached: Valid cached hashes already looked up for (at least) these
+                    paths; the cache is queried when not given
+
+        Returns:
+            Dict mapping path to hash (files that failed to hash are left out)
+        """
+        hashes = {}
+        if self.cache:
+            if cached is None:
+                hashes = self.cache.get_cached_hashes(file_stats, stats=file_stats)
+            else:
+                hashes = {path: cached[path] for path in file_stats if path in cached}
+            self._cache_hits += len(hashes)
+
+        # Read misses in inode order, which tends to follow on-disk layout
+        misses = sorted(
+            (path for path in file_stats if path not in hashes),
+            key=lambda path: (file_stats[path].st_dev, file_stats[path].st_ino),
+        )
+        if self.cache:
+            self._cache_misses += len(misses)
+
+        new_hashes = {}
+        if len(misses) == 1:
+            # Not worth starting a pool for a single file
+            try:
+                new_hashes[misses[0]] = hash_file(misses[0])
+            except Exception as e:
+                self.logger.error(f"Error hashing file {misses[0]}: {e}")
+        elif misses:
+            with ThreadPoolExecutor(max_workers=min(self.HASH_WORKERS, len(misses))) as executor:
+                futures = {executor.submit(hash_file, path): path for path in misses}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        new_hashes[path] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error hashing file {path}: {e}")
+
+        if self.cache and new_hashes:
+            self.cache.store_hashes(new_hashes, stats=file_stats)
+
+        hashes.update(new_hashes)
+        return hashes
+
     def get_cache_stats(self) -> CacheStats:
         """Get cache hit/miss statistics."""
         total = self._cache_hits + self._cache_misses
@@ -251,4 +578,7 @@ class FileAnalyzer:
         Returns:
             True if file is a media file
         """
-        return Path(file_path).suffix.lower() in self.media_extensions
+        # Same rule as Path.suffix and _stat_entries: a leading dot in the name
+        # (e.g. '.mkv') is a hidden file, not an extension
+        dot = file_path.rfind('.')
+        return dot > file_path.rfind(os.sep) + 1 and file_path[dot:].lower() in self._media_ext
@@ -3,22 +3,38 @@
 import os
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import logging
-from peewee import SqliteDatabase, Model, CharField, IntegerField, FloatField
+from peewee import SqliteDatabase, Model, CharField, IntegerField, FloatField, chunked
 
 from src.models import FileCacheStats
 
 
 db = SqliteDatabase(None)
 
+# WAL + relaxed sync: a lost write after a crash only means a file gets re-hashed
+CACHE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'temp_store': 'memory',
+    'cache_size': -64 * 1024,  # 64 MB (negative = KiB)
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Rows per statement in batch operations (stays under SQLite's bound-variable limit)
+BATCH_SIZE = 500
+
+# Stored in PRAGMA user_version; bump whenever hash_file() output changes so stale digests are dropped
+# 1: xxh3_128 (previously unversioned xxh64)
+CACHE_VERSION = 1
+
 
 class FileCacheEntry(Model):
     """File cache entry model."""
     path = CharField(primary_key=True)   # Absolute file path
     size = IntegerField()                # File size in bytes
     mtime = FloatField()                 # Modification time (Unix timestamp)
-    hash = CharField()                   # xxhash hex string
+    hash = CharField()                   # xxh3_128 hex string
     last_accessed = FloatField()         # Last access time (Unix timestamp)
 
     class Meta:
@@ -26,6 +42,15 @@ class FileCacheEntry(Model):
         table_name = 'file_cache'
 
 
+# Hot-path statements for single-file lookups and stores
+_SELECT_ENTRY_SQL = 'SELECT size, mtime, hash FROM file_cache WHERE path = ?'
+_TOUCH_ENTRY_SQL = 'UPDATE file_cache SET last_accessed = ? WHERE path = ?'
+_REPLACE_ENTRY_SQL = (
+    'INSERT OR REPLACE INTO file_cache (path, size, mtime, hash, last_accessed) '
+    'VALUES (?, ?, ?, ?, ?)'
+)
+
+
 class FileCache:
     """SQLite-based file hash cache."""
 
@@ -47,79 +72,162 @@ class FileCache:
         self.db_path = db_path
 
         # Initialize database
-        db.init(db_path)
+        db.init(db_path, pragmas=CACHE_PRAGMAS)
         db.connect()
         db.create_tables([FileCacheEntry])
+        self._check_version()
 
         self.logger.info(f"Initialized file cache at {db_path}")
 
-    def get_cached_hash(self, file_path: str) -> Optional[str]:
+    def _check_version(self):
+        """Drop all entries if they were written by a different hash algorithm."""
+        version = db.execute_sql('PRAGMA user_version').fetchone()[0]
+        if version != CACHE_VERSION:
+            FileCacheEntry.delete().execute()
+            db.execute_sql(f'PRAGMA user_version = {CACHE_VERSION}')
+            self.logger.info(f"File cache version changed ({version} -> {CACHE_VERSION}), cleared cached hashes")
+
+    def get_cached_hash(self, file_path: str, size: Optional[int] = None,
+                        mtime: Optional[float] = None) -> Optional[str]:
         """
         Get cached hash for file if it exists and is still valid.
 
         Args:
             file_path: Absolute path to file
+            size: Current file size, if the caller already has it
+            mtime: Current file mtime, if the caller already has it
 
         Returns:
             Cached hash if valid, None otherwise
         """
         try:
-            # Get current file stats
-            stat = os.stat(file_path)
-            size = stat.st_size
-            mtime = stat.st_mtime
+            # Get current file stats unless the caller passed them in
+            if size is None or mtime is None:
+                stat = os.stat(file_path)
+                size = stat.st_size
+                mtime = stat.st_mtime
+
+            # Look up in cache (raw SQL: avoids building a model instance per lookup)
+            row = db.execute_sql(_SELECT_ENTRY_SQL, (file_path,)).fetchone()
+            if row is None:
+                self.logger.debug("Cache miss: %s", file_path)
+                return None
 
-            # Look up in cache
-            try:
-                entry = FileCacheEntry.get(FileCacheEntry.path == file_path)
-
-                # Check if cache is still valid (size and mtime match)
-                if entry.size == size and entry.mtime == mtime:
-                    # Update last_accessed
-                    entry.last_accessed = time.time()
-                    entry.save()
-
-                    self.logger.debug(f"Cache hit: {file_path}")
-                    return entry.hash
-                else:
-                    self.logger.debug(f"Cache invalid (size/mtime changed): {file_path}")
-                    return None
-
-            except FileCacheEntry.DoesNotExist:
-                self.logger.debug(f"Cache miss: {file_path}")
+            # Check if cache is still valid (size and mtime match)
+            cached_size, cached_mtime, cached_hash = row
+            if cached_size != size or cached_mtime != mtime:
+                self.logger.debug("Cache invalid (size/mtime changed): %s", file_path)
                 return None
 
+            db.execute_sql(_TOUCH_ENTRY_SQL, (time.time(), file_path))
+
+            self.logger.debug("Cache hit: %s", file_path)
+            return cached_hash
+
         except OSError as e:
             self.logger.warning(f"Error checking cache for {file_path}: {e}")
             return None
 
-    def store_hash(self, file_path: str, file_hash: str):
+    def store_hash(self, file_path: str, file_hash: str, size: Optional[int] = None,
+                   mtime: Optional[float] = None):
         """
         Store or update file hash in cache.
 
         Args:
             file_path: Absolute path to file
-            file_hash: xxhash hex string
+            file_hash: xxh3_128 hex string
+            size: File size the hash was computed for, if the caller already has it
+            mtime: File mtime the hash was computed for, if the caller already has it
         """
         try:
-            stat = os.stat(file_path)
-            size = stat.st_size
-            mtime = stat.st_mtime
+            if size is None or mtime is None:
+                stat = os.stat(file_path)
+                size = stat.st_size
+                mtime = stat.st_mtime
             now = time.time()
 
-            FileCacheEntry.replace(
-                path=file_path,
-                size=size,
-                mtime=mtime,
-                hash=file_hash,
-                last_accessed=now
-            ).execute()
+            db.execute_sql(_REPLACE_ENTRY_SQL, (file_path, size, mtime, file_hash, now))
 
-            self.logger.debug(f"Cached hash for: {file_path}")
+            self.logger.debug("Cached hash for: %s", file_path)
 
         except OSError as e:
             self.logger.warning(f"Error storing cache for {file_path}: {e}")
 
+    def get_cached_hashes(self, file_paths: Iterable[str],
+                          stats: Optional[Dict[str, os.stat_result]] = None) -> Dict[str, str]:
+        """
+        Get valid cached hashes for many files using batched queries.
+
+        Args:
+            file_paths: Absolute paths to files
+            stats: Optional current stat results by path (missing paths are stat'ed)
+
+        Returns:
+            Dict mapping path to cached hash, for paths with a valid entry only
+        """
+        current = {}
+        for file_path in file_paths:
+            try:
+                stat = stats.get(file_path) if stats else None
+                if stat is None:
+                    stat = os.stat(file_path)
+                current[file_path] = (stat.st_size, stat.st_mtime)
+            except OSError as e:
+                self.logger.warning(f"Error checking cache for {file_path}: {e}")
+
+        hits = {}
+        for batch in chunked(list(current), BATCH_SIZE):
+            query = (FileCacheEntry
+                     .select(FileCacheEntry.path, FileCacheEntry.size, FileCacheEntry.mtime, FileCacheEntry.hash)
+                     .where(FileCacheEntry.path.in_(batch))
+                     .tuples())
+            for path, size, mtime, file_hash in query:
+                if current[path] == (size, mtime):
+                    hits[path] = file_hash
+
+        if hits:
+            now = time.time()
+            with db.atomic():
+                for batch in chunked(list(hits), BATCH_SIZE):
+                    FileCacheEntry.update(last_accessed=now).where(FileCacheEntry.path.in_(batch)).execute()
+
+        self.logger.debug("Batch cache lookup: %s/%s hits", len(hits), len(current))
+        return hits
+
+    def store_hashes(self, hashes: Dict[str, str],
+                     stats: Optional[Dict[str, os.stat_result]] = None):
+        """
+        Store or update hashes for many files in a single transaction.
+
+        Args:
+            hashes: Dict mapping absolute file path to xxh3_128 hex string
+            stats: Optional stat results the hashes were computed for (missing paths are stat'ed)
+        """
+        now = time.time()
+        rows = []
+        for file_path, file_hash in hashes.items():
+            try:
+                stat = stats.get(file_path) if stats else None
+                if stat is None:
+                    stat = os.stat(file_path)
+            except OSError as e:
+                self.logger.warning(f"Error storing cache for {file_path}: {e}")
+                continue
+            rows.append({
+                'path': file_path,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'hash': file_hash,
+                'last_accessed': now,
+            })
+
+        with db.atomic():
+            # 5 columns per row
+            for batch in chunked(rows, BATCH_SIZE // 5):
+                FileCacheEntry.insert_many(batch).on_conflict_replace().execute()
+
+        self.logger.debug("Cached %s hashes", len(rows))
+
     def clear_cache(self):
         """Clear all cached entries."""
         try:
@@ -1,13 +1,16 @@
 """Hardlink repair with rollback capability."""
 
 import os
-import shutil
-from pathlib import Path
+import stat
 import logging
+import uuid
 from typing import List
 
 from src.models import HardlinkAction, HardlinkResult, HardlinkBatchResult, HardlinkFixResult, SizeIndex
 
+# Unique temporary link names tried before giving up (a collision needs a file with the same random suffix)
+TEMP_LINK_ATTEMPTS = 5
+
 
 class HardlinkFixer:
     """Fix broken hardlinks atomically with rollback support."""
@@ -21,10 +24,12 @@ class HardlinkFixer:
         Replace orphaned file with hardlink to media file.
 
         This operation is atomic:
-        1. Rename orphaned file to .bak
-        2. Create hardlink from media file
-        3. On success: delete .bak
-        4. On failure: restore .bak
+        1. Create hardlink from media file at a new, uniquely named path beside the orphaned file
+        2. rename() it over the orphaned file (atomic replace)
+        3. On failure: remove the temporary link; the orphaned file is never moved
+
+        Only the temporary link created by this call is ever removed, so an
+        existing file that happens to share its name is left alone.
 
         Args:
             orphaned_file: Path to orphaned file
@@ -34,46 +39,43 @@ class HardlinkFixer:
         Returns:
             HardlinkResult with success flag, action type, and message
         """
-        orphaned_path = Path(orphaned_file)
-        media_path = Path(media_file)
-        backup_path = orphaned_path.with_suffix(orphaned_path.suffix + '.bak')
-
-        if not orphaned_path.exists():
-            return HardlinkResult(
-                success=False,
-                action=HardlinkAction.VALIDATION_FAILED,
-                message=f"Orphaned file does not exist: {orphaned_file}"
-            )
-
-        if not media_path.exists():
+        # One stat per path covers existence, file type and size checks
+        try:
+            try:
+                orphaned_stat = os.stat(orphaned_file)
+            except FileNotFoundError:
+                return HardlinkResult(
+                    success=False,
+                    action=HardlinkAction.VALIDATION_FAILED,
+                    message=f"Orphaned file does not exist: {orphaned_file}"
+                )
+            try:
+                media_stat = os.stat(media_file)
+            except FileNotFoundError:
+                return HardlinkResult(
+                    success=False,
+                    action=HardlinkAction.VALIDATION_FAILED,
+                    message=f"Media file does not exist: {media_file}"
+                )
+        except OSError as e:
             return HardlinkResult(
                 success=False,
-                action=HardlinkAction.VALIDATION_FAILED,
-                message=f"Media file does not exist: {media_file}"
+                action=HardlinkAction.STAT_FAILED,
+                message=f"Failed to stat files: {e}"
             )
 
-        if not orphaned_path.is_file() or not media_path.is_file():
+        if not stat.S_ISREG(orphaned_stat.st_mode) or not stat.S_ISREG(media_stat.st_mode):
             return HardlinkResult(
                 success=False,
                 action=HardlinkAction.VALIDATION_FAILED,
                 message="Both paths must be regular files"
             )
 
-        try:
-            orphaned_size = os.stat(orphaned_path).st_size
-            media_size = os.stat(media_path).st_size
-
-            if orphaned_size != media_size:
-                return HardlinkResult(
-                    success=False,
-                    action=HardlinkAction.SIZE_MISMATCH,
-                    message=f"Size mismatch: orphaned={orphaned_size}, media={media_size}"
-                )
-        except OSError as e:
+        if orphaned_stat.st_size != media_stat.st_size:
             return HardlinkResult(
                 success=False,
-                action=HardlinkAction.STAT_FAILED,
-                message=f"Failed to stat files: {e}"
+                action=HardlinkAction.SIZE_MISMATCH,
+                message=f"Size mismatch: orphaned={orphaned_stat.st_size}, media={media_stat.st_size}"
             )
 
         if dry_run:
@@ -85,56 +87,66 @@ class HardlinkFixer:
             )
 
         try:
-            # Step 1: Rename orphaned file to .bak
-            self.logger.debug(f"Backing up: {orphaned_file} -> {backup_path}")
-            orphaned_path.rename(backup_path)
+            # Step 1: Create hardlink beside the orphaned file (same directory, so the rename stays on one filesystem)
+            link_path = self._link_to_temp_path(media_file, orphaned_file)
+        except OSError as e:
+            self.logger.error(f"Failed to create hardlink: {e}")
+            return HardlinkResult(
+                success=False,
+                action=HardlinkAction.LINK_FAILED,
+                message=f"Failed to create hardlink (original untouched): {e}"
+            )
 
+        try:
+            # Step 2: Atomically replace the orphaned file with the hardlink
+            self.logger.debug("Replacing: %s -> %s", link_path, orphaned_file)
+            os.replace(link_path, orphaned_file)
+        except OSError as e:
+            self.logger.error(f"Failed to replace orphaned file with hardlink: {e}")
             try:
-                # Step 2: Create hardlink
-                self.logger.debug(f"Creating hardlink: {media_file} -> {orphaned_file}")
-                os.link(media_path, orphaned_path)
+                os.unlink(link_path)
+            except OSError as cleanup_error:
+                self.logger.warning(f"Failed to remove temporary hardlink {link_path}: {cleanup_error}")
+            return HardlinkResult(
+                success=False,
+                action=HardlinkAction.LINK_FAILED,
+                message=f"Failed to replace orphaned file with hardlink (original untouched): {e}"
+            )
 
-                # Step 3: Success - delete backup
-                self.logger.debug(f"Deleting backup: {backup_path}")
-                backup_path.unlink()
+        self.logger.info(f"Successfully fixed hardlink: {orphaned_file} -> {media_file}")
+        return HardlinkResult(
+            success=True,
+            action=HardlinkAction.FIXED,
+            message=f"Created hardlink to {media_file}"
+        )
 
-                self.logger.info(f"Successfully fixed hardlink: {orphaned_file} -> {media_file}")
-                return HardlinkResult(
-                    success=True,
-                    action=HardlinkAction.FIXED,
-                    message=f"Created hardlink to {media_file}"
-                )
+    def _link_to_temp_path(self, media_file: str, orphaned_file: str) -> str:
+        """
+        Hardlink media file to a fresh temporary name beside the orphaned file.
 
-            except OSError as e:
-                # Step 4: Failure - restore backup
-                self.logger.error(f"Failed to create hardlink: {e}")
-                self.logger.info(f"Restoring backup: {backup_path} -> {orphaned_file}")
-
-                try:
-                    backup_path.rename(orphaned_path)
-                    return HardlinkResult(
-                        success=False,
-                        action=HardlinkAction.LINK_FAILED_RESTORED,
-                        message=f"Failed to create hardlink (backup restored): {e}"
-                    )
-                except OSError as restore_error:
-                    self.logger.critical(
-                        f"CRITICAL: Failed to restore backup! "
-                        f"Original: {orphaned_file}, Backup: {backup_path}, Error: {restore_error}"
-                    )
-                    return HardlinkResult(
-                        success=False,
-                        action=HardlinkAction.LINK_FAILED_RESTORE_FAILED,
-                        message=f"Failed to create hardlink AND restore backup: {e}, {restore_error}"
-                    )
+        os.link() never overwrites, so a name that already exists is skipped
+        and another random suffix is tried.
 
-        except OSError as e:
-            self.logger.error(f"Failed to backup file: {e}")
-            return HardlinkResult(
-                success=False,
-                action=HardlinkAction.BACKUP_FAILED,
-                message=f"Failed to backup file: {e}"
-            )
+        Args:
+            media_file: Path to media file to link to
+            orphaned_file: Path to orphaned file the link will replace
+
+        Returns:
+            Path of the created temporary link
+
+        Raises:
+            OSError: If the link can't be created
+        """
+        for _ in range(TEMP_LINK_ATTEMPTS):
+            link_path = f"{orphaned_file}.{uuid.uuid4().hex[:12]}.newlink"
+            self.logger.debug("Creating hardlink: %s -> %s", media_file, link_path)
+            try:
+                os.link(media_file, link_path)
+            except FileExistsError as e:
+                error = e
+                continue
+            return link_path
+        raise error
 
     def fix_orphaned_files(
         self,
@@ -174,14 +186,16 @@ class HardlinkFixer:
 
         self.logger.info(f"Attempting to fix {len(orphaned_files)} orphaned files...")
 
+        # Find identical files in media library (one batch, so shared candidates are hashed once)
+        matches = file_analyzer.find_identical_files(orphaned_files, size_index=size_index)
+
         for orphaned_file in orphaned_files:
             attempted += 1
 
-            # Find identical file in media library
-            media_file = file_analyzer.find_identical_file(orphaned_file, size_index=size_index)
+            media_file = matches[orphaned_file]
 
             if media_file:
-                self.logger.info(f"  Found match for: {Path(orphaned_file).name}")
+                self.logger.info(f"  Found match for: {os.path.basename(orphaned_file)}")
 
                 # Fix hardlink
                 result = self.fix_hardlink(orphaned_file, media_file, dry_run=dry_run)
@@ -196,9 +210,9 @@ class HardlinkFixer:
                     # Check if this is a media file
                     if file_analyzer.is_media_file(orphaned_file):
                         media_files_fixed += 1
-                        self.logger.info(f"  Fixed media file hardlink: {Path(orphaned_file).name}")
+                        self.logger.info(f"  Fixed media file hardlink: {os.path.basename(orphaned_file)}")
                     else:
-                        self.logger.info(f"  Fixed hardlink: {Path(orphaned_file).name}")
+                        self.logger.info(f"  Fixed hardlink: {os.path.basename(orphaned_file)}")
                 else:
                     failed += 1
                     self.logger.warning(f"  Failed to fix hardlink: {result.message}")
@@ -209,7 +223,7 @@ class HardlinkFixer:
                     result=result
                 ))
             else:
-                self.logger.debug(f"  No match found for: {Path(orphaned_file).name}")
+                self.logger.debug("  No match found for: %s", os.path.basename(orphaned_file))
 
         return HardlinkBatchResult(
             attempted=attempted,
@@ -3,10 +3,10 @@
 import sys
 import os
 import fcntl
-from pathlib import Path
 import logging
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.config import Config
 from src.utils.logger import setup_logger
@@ -16,9 +16,14 @@ from src.hardlink_fixer import HardlinkFixer
 from src.torrent_cleaner import TorrentCleaner
 from src.discord_notifier import DiscordNotifier
 from src.models import HardlinkFailure, SizeIndex, WorkflowStats
-from typing import Dict, List
+from typing import Dict, FrozenSet, List, Set
 import qbittorrentapi
 
+_LOGGER = logging.getLogger(__name__)
+
+# Concurrent per-torrent API requests; stays within QBittorrentClient.POOL_MAXSIZE connections
+API_WORKERS = 8
+
 
 class SpaceAccountant:
     """Track pending unlinks per inode to accurately estimate freed disk space.
@@ -29,46 +34,95 @@ class SpaceAccountant:
     """
 
     def __init__(self):
-        self._pending_unlinks: Dict[int, int] = defaultdict(int)
-        self._nlinks: Dict[int, int] = {}
-        self._sizes: Dict[int, int] = {}
+        # inode -> [pending unlinks, nlink, size]; one record keeps it to one dict lookup per path
+        self._inodes: Dict[int, List[int]] = {}
 
     def estimate_freed(self, file_paths: List[str]) -> int:
         """Estimate bytes freed by deleting the given file paths.
 
         Tracks inodes across calls so that hardlinked files shared between
         multiple torrents are only counted once (when the last link is removed).
-        Missing files are silently skipped.
+        Missing files are silently skipped. Every path is stat'ed at call time,
+        so files removed or replaced earlier in the run are never counted.
+
+        Args:
+            file_paths: Paths that will be deleted
         """
         freed = 0
+        inodes = self._inodes
         for path in file_paths:
             try:
                 stat = os.stat(path)
             except OSError:
                 continue
-            inode = stat.st_ino
-            if inode not in self._nlinks:
-                self._nlinks[inode] = stat.st_nlink
-                self._sizes[inode] = stat.st_size
-            self._pending_unlinks[inode] += 1
-            if self._nlinks[inode] == self._pending_unlinks[inode]:
-                freed += self._sizes[inode]
+            record = inodes.get(stat.st_ino)
+            if record is None:
+                record = inodes[stat.st_ino] = [0, stat.st_nlink, stat.st_size]
+            record[0] += 1
+            if record[0] == record[1]:
+                freed += record[2]
         return freed
 
 
-def is_dead_tracker_torrent(qbt_client: QBittorrentClient, torrent: qbittorrentapi.TorrentDictionary, dead_messages: List[str]) -> bool:
+class TorrentGroups:
+    """Union-find over torrent hashes for grouping torrents that share files.
+
+    Merging is near-constant time (path halving + union by rank), so large
+    groups are never copied or rewritten while inodes are processed.
+    """
+
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+        self._rank: Dict[str, int] = {}
+
+    def find(self, torrent_hash: str) -> str:
+        """Return the root hash of the group containing torrent_hash."""
+        parent = self._parent
+        if torrent_hash not in parent:
+            parent[torrent_hash] = torrent_hash
+            self._rank[torrent_hash] = 0
+            return torrent_hash
+        while parent[torrent_hash] != torrent_hash:
+            parent[torrent_hash] = parent[parent[torrent_hash]]
+            torrent_hash = parent[torrent_hash]
+        return torrent_hash
+
+    def union(self, a: str, b: str) -> str:
+        """Merge the groups containing a and b, returning the new root."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+        return root_a
+
+    def __contains__(self, torrent_hash: str) -> bool:
+        return torrent_hash in self._parent
+
+    def groups(self) -> Dict[str, Set[str]]:
+        """Return a mapping of root hash to the set of hashes in its group."""
+        groups: Dict[str, Set[str]] = defaultdict(set)
+        for torrent_hash in self._parent:
+            groups[self.find(torrent_hash)].add(torrent_hash)
+        return dict(groups)
+
+
+def is_dead_tracker_torrent(qbt_client: QBittorrentClient, torrent: qbittorrentapi.TorrentDictionary, dead_messages: FrozenSet[str]) -> bool:
     """
     Check if all real trackers for a torrent report known-dead messages.
 
     Args:
         qbt_client: QBittorrentClient instance
         torrent: Torrent dictionary from qBittorrent API
-        dead_messages: List of substrings to match against tracker error messages
+        dead_messages: Lower-cased tracker error messages that mark a tracker as dead
 
     Returns:
         True if all real trackers are dead
     """
-    logger = logging.getLogger(__name__)
+    logger = _LOGGER
     try:
         trackers = qbt_client.torrents_trackers(torrent.hash)
     except Exception as e:
@@ -86,13 +140,98 @@ def is_dead_tracker_torrent(qbt_client: QBittorrentClient, torrent: qbittorrenta
         if tracker.status != 4:
             return False
         msg = (tracker.msg or '').lower()
-        if msg not in (dead_msg.lower() for dead_msg in dead_messages):
+        if msg not in dead_messages:
             return False
 
     return True
 
 
-def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: FileAnalyzer, hardlink_fixer: HardlinkFixer, torrent_cleaner: TorrentCleaner, size_index: SizeIndex) -> WorkflowStats:
+def is_in_media_library(file_analyzer: FileAnalyzer, file_path: str, size_index: SizeIndex, memo: Dict[tuple, bool]) -> bool:
+    """
+    Check whether a file has an identical copy in the media library, memoized per inode.
+
+    Torrents that share hardlinked files would otherwise repeat the same
+    candidate stat/hash work once per torrent. Entries are keyed by
+    (dev, inode, size, mtime_ns) so a changed file is looked up again.
+
+    Args:
+        file_analyzer: FileAnalyzer instance
+        file_path: Path to the file to look up
+        size_index: SizeIndex of the media library
+        memo: Dict holding results across calls
+
+    Returns:
+        True if an identical file exists in the media library
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return file_analyzer.find_identical_file(file_path, size_index=size_index) is not None
+
+    # Already a hardlink to an indexed library file: no candidate stats or hashing needed
+    if size_index.has_inode(file_stat.st_dev, file_stat.st_ino):
+        return True
+
+    key = (file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+    found = memo.get(key)
+    if found is None:
+        found = memo[key] = file_analyzer.find_identical_file(file_path, size_index=size_index) is not None
+    return found
+
+
+def find_dead_tracker_torrents(qbt_client: QBittorrentClient, torrents: List[qbittorrentapi.TorrentDictionary], dead_messages: List[str], max_workers: int = API_WORKERS) -> List[qbittorrentapi.TorrentDictionary]:
+    """
+    Check many torrents for dead trackers concurrently.
+
+    Each check is a WebUI round-trip, so threads overlap the network wait.
+
+    Args:
+        qbt_client: QBittorrentClient instance
+        torrents: Torrents to check
+        dead_messages: Tracker error messages that mark a tracker as dead
+        max_workers: Maximum concurrent requests to qBittorrent
+
+    Returns:
+        Torrents whose trackers are all dead, in their original order
+    """
+    if not dead_messages:
+        return []
+    # Lower-case once rather than per tracker of every torrent
+    dead_messages = frozenset(m.lower() for m in dead_messages)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        dead = list(executor.map(lambda t: is_dead_tracker_torrent(qbt_client, t, dead_messages), torrents))
+    return [torrent for torrent, is_dead in zip(torrents, dead) if is_dead]
+
+
+def fetch_torrent_files(qbt_client: QBittorrentClient, torrents: List[qbittorrentapi.TorrentDictionary], max_workers: int = API_WORKERS) -> Dict[str, qbittorrentapi.TorrentFilesList]:
+    """
+    Fetch file lists for many torrents concurrently.
+
+    Each request is a WebUI round-trip, so threads overlap the network wait.
+    Torrents whose file list could not be fetched are logged and left out.
+
+    Args:
+        qbt_client: QBittorrentClient instance
+        torrents: Torrents to fetch file lists for
+        max_workers: Maximum concurrent requests to qBittorrent
+
+    Returns:
+        Dict mapping torrent hash to its file list
+    """
+    logger = _LOGGER
+    files_by_hash = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(qbt_client.torrents_files, t.hash): t for t in torrents}
+        for future in as_completed(futures):
+            torrent = futures[future]
+            try:
+                files_by_hash[torrent.hash] = future.result()
+            except Exception as e:
+                logger.warning(f"Could not get file info for torrent {torrent.name}: {e}")
+    return files_by_hash
+
+
+def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: FileAnalyzer, hardlink_fixer: HardlinkFixer, torrent_cleaner: TorrentCleaner, size_index: SizeIndex | None = None) -> WorkflowStats:
     """
     Run the torrent cleaning workflow.
 
@@ -102,12 +241,14 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
         file_analyzer: FileAnalyzer instance
         hardlink_fixer: HardlinkFixer instance
         torrent_cleaner: TorrentCleaner instance
-        size_index: SizeIndex mapping file sizes to lists of file paths
+        size_index: SizeIndex mapping file sizes to lists of file paths. If None,
+                    the media library is indexed after torrent file lists are
+                    fetched, keeping only sizes that occur in those torrents.
 
     Returns:
         WorkflowStats with workflow statistics
     """
-    logger = logging.getLogger(__name__)
+    logger = _LOGGER
     stats = WorkflowStats()
     space_accountant = SpaceAccountant()
 
@@ -116,36 +257,36 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
 
     # --- Dead tracker pass ---
     deleted_hashes = set()
-    if config.delete_dead_trackers:
+    # Without any dead messages no tracker can match, so skip the pass and its API calls
+    if config.delete_dead_trackers and config.dead_tracker_messages:
         logger.info("Checking for dead tracker torrents...")
-        for torrent in torrents:
-            if is_dead_tracker_torrent(qbt_client, torrent, config.dead_tracker_messages):
-                logger.info(f"  Dead tracker detected: {torrent.name}")
-                try:
-                    torrent_files = qbt_client.torrents_files(torrent.hash)
-                    dead_file_paths = [str(Path(torrent.save_path) / tf.name) for tf in torrent_files]
-                    size = space_accountant.estimate_freed(dead_file_paths)
-                except Exception as e:
-                    logger.warning(f"  Could not estimate space for {torrent.name}: {e}")
-                    size = torrent.size
-                success = torrent_cleaner.delete_torrent(
-                    torrent.hash,
-                    torrent.name,
-                    delete_files=True
-                )
-                if success:
-                    deleted_hashes.add(torrent.hash)
-                    stats.torrents_deleted_dead_tracker += 1
-                    stats.space_freed_dead_tracker_bytes += size
-                    stats.deleted_torrents.append(f"[dead tracker] {torrent.name}")
-                    stats.torrents_deleted += 1
-                    stats.torrents_processed += 1
+        # Tracker checks run concurrently; sizes are estimated in order, then all are deleted in bulk
+        dead_torrents = find_dead_tracker_torrents(qbt_client, torrents, config.dead_tracker_messages)
+        dead_files = fetch_torrent_files(qbt_client, dead_torrents)
+        dead_sizes = {}
+        for torrent in dead_torrents:
+            logger.info(f"  Dead tracker detected: {torrent.name}")
+            torrent_files = dead_files.get(torrent.hash)
+            if torrent_files is None:
+                logger.warning(f"  Could not estimate space for {torrent.name}, using torrent size")
+                dead_sizes[torrent.hash] = torrent.size
+                continue
+            dead_file_paths = [os.path.join(torrent.save_path, tf.name) for tf in torrent_files]
+            dead_sizes[torrent.hash] = space_accountant.estimate_freed(dead_file_paths)
+        if dead_torrents:
+            deleted_hashes = torrent_cleaner.delete_torrents(dead_torrents, delete_files=True)
+        for torrent in dead_torrents:
+            if torrent.hash in deleted_hashes:
+                stats.torrents_deleted_dead_tracker += 1
+                stats.space_freed_dead_tracker_bytes += dead_sizes[torrent.hash]
+                stats.deleted_torrents.append(f"[dead tracker] {torrent.name}")
+                stats.torrents_deleted += 1
+                stats.torrents_processed += 1
 
         if deleted_hashes:
             logger.info(f"Dead tracker pass: deleted {len(deleted_hashes)} torrent(s)")
-            # Re-fetch torrents to get fresh state after deletions
-            torrents = qbt_client.torrents_info()
-            # Filter out dry-run "deleted" torrents that still exist in qBittorrent
+            # Deleting torrents doesn't change the others, so the list fetched above stays
+            # current; drop the deleted ones (and dry-run "deleted" ones still in qBittorrent)
             torrents = [t for t in torrents if t.hash not in deleted_hashes]
         else:
             logger.info("Dead tracker pass: no dead tracker torrents found")
@@ -153,48 +294,73 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
     # Build torrent groups for aggregation
     # When multiple torrents share files (hardlinked), aggregate their stats
     logger.info("Building torrent groups for stat aggregation...")
-    inode_to_torrents = defaultdict(set)
+    # First torrent seen holding each inode; a second holder is merged into its group
+    # right away, so no per-inode set is kept for the (common) single-holder case
+    inode_owner: Dict[int, str] = {}
+    torrent_groups = TorrentGroups()
     torrent_hash_to_torrent = {t.hash: t for t in torrents}
+    # File lists fetched here are reused by the processing pass (one API call per torrent)
+    torrent_files_cache = fetch_torrent_files(qbt_client, torrents)
+    # Cross-seeded torrents often list the same paths; stat each path once (None = missing).
+    # The results are reused for orphan detection below.
+    path_stats: Dict[str, os.stat_result | None] = {}
+    # Joined once here and handed to every later consumer as plain strings
+    torrent_file_paths: Dict[str, List[str]] = {}
 
     for torrent in torrents:
+        torrent_files = torrent_files_cache.get(torrent.hash)
+        if torrent_files is None:
+            continue
         try:
-            save_path = Path(torrent.save_path)
-            torrent_files = qbt_client.torrents_files(torrent.hash)
-
-            for tf in torrent_files:
-                file_path = save_path / tf.name
-                if file_path.exists():
-                    inode = os.stat(file_path).st_ino
-                    inode_to_torrents[inode].add(torrent.hash)
+            save_path = torrent.save_path
+            file_paths = torrent_file_paths[torrent.hash] = [os.path.join(save_path, tf.name) for tf in torrent_files]
+            for file_path in file_paths:
+                if file_path in path_stats:
+                    file_stat = path_stats[file_path]
+                else:
+                    # One stat per file. Like the exists() check it replaces, any stat error
+                    # (missing, a file used as a directory, symlink loop, no permission)
+                    # marks just this path as missing instead of skipping the rest of the torrent
+                    try:
+                        file_stat = os.stat(file_path)
+                    except OSError:
+                        file_stat = None
+                    path_stats[file_path] = file_stat
+                if file_stat is not None:
+                    owner = inode_owner.setdefault(file_stat.st_ino, torrent.hash)
+                    if owner != torrent.hash:
+                        # Multiple torrents share this file - they're in a group
+                        torrent_groups.union(owner, torrent.hash)
         except Exception as e:
             logger.warning(f"Could not get file info for torrent {torrent.name}: {e}")
 
-    # Build torrent groups (torrents sharing at least one file)
-    torrent_to_group = {}
-    for inode, torrent_hashes in inode_to_torrents.items():
-        if len(torrent_hashes) > 1:
-            # Multiple torrents share this file - they're in a group
-            group = set(torrent_hashes)
-            # Merge with existing groups
-            for th in list(torrent_hashes):
-                if th in torrent_to_group:
-                    group.update(torrent_to_group[th])
-            # Update all torrents in the merged group
-            for th in group:
-                torrent_to_group[th] = group
-
-    # Calculate aggregate stats for each group
+    if size_index is None:
+        # Only sizes present in torrents can match; index everything if any file list is missing
+        needed_sizes = None
+        if len(torrent_files_cache) == len(torrents):
+            needed_sizes = {tf.size for files in torrent_files_cache.values() for tf in files}
+        logger.info("Building media library size index...")
+        size_index = file_analyzer.build_size_index(config.media_library_dir, sizes=needed_sizes)
+
+    # Calculate aggregate stats once per group, keyed by the group's root hash
     group_stats = {}
-    for torrent_hash, group in torrent_to_group.items():
-        group_key = frozenset(group)
-        if group_key not in group_stats:
-            max_seeding_time = max(torrent_hash_to_torrent[th].seeding_time for th in group)
-            sum_ratio = sum(torrent_hash_to_torrent[th].ratio for th in group)
-            group_stats[group_key] = {
-                'seeding_time': max_seeding_time,
-                'ratio': sum_ratio
-            }
-            logger.info(f"  Group of {len(group)} torrents: max_seeding_time={max_seeding_time}s, sum_ratio={sum_ratio:.2f}")
+    for root, group in torrent_groups.groups().items():
+        # Look each member up once instead of once per aggregate
+        members = [torrent_hash_to_torrent[th] for th in group]
+        max_seeding_time = max(t.seeding_time for t in members)
+        sum_ratio = sum(t.ratio for t in members)
+        group_stats[root] = {
+            'seeding_time': max_seeding_time,
+            'ratio': sum_ratio,
+            'size': len(group),
+        }
+        logger.info(f"  Group of {len(group)} torrents: max_seeding_time={max_seeding_time}s, sum_ratio={sum_ratio:.2f}")
+
+    # Media library lookups for linked files, shared by every torrent holding a link to the same inode
+    library_matches: Dict[tuple, bool] = {}
+
+    # Deleting or relinking files changes link counts, so cached stats are only used until the first change
+    files_changed = False
 
     logger.info(f"Processing {len(torrents)} torrents...")
     processed_count = 0
@@ -204,15 +370,14 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
 
         torrent_name = torrent.name
         torrent_hash = torrent.hash
-        save_path = Path(torrent.save_path)
+        save_path = torrent.save_path
 
         logger.info(f"\nProcessing torrent [{processed_count}/{len(torrents)}]: {torrent_name}")
 
         # Check if torrent is part of a group
-        if torrent_hash in torrent_to_group:
-            group_key = frozenset(torrent_to_group[torrent_hash])
-            aggregate = group_stats[group_key]
-            logger.info(f"  Part of group with {len(torrent_to_group[torrent_hash])} torrents: "
+        if torrent_hash in torrent_groups:
+            aggregate = group_stats[torrent_groups.find(torrent_hash)]
+            logger.info(f"  Part of group with {aggregate['size']} torrents: "
                        f"aggregate seeding_time={aggregate['seeding_time']}s, ratio={aggregate['ratio']:.2f}")
             deletion_check = torrent_cleaner.should_delete_torrent(
                 torrent,
@@ -232,12 +397,16 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
 
         # --- Hardlink analysis and fixing (all completed torrents) ---
         try:
-            torrent_files = qbt_client.torrents_files(torrent_hash)
-            file_paths = [str(save_path / tf.name) for tf in torrent_files]
+            file_paths = torrent_file_paths.get(torrent_hash)
+            if file_paths is None:
+                torrent_files = qbt_client.torrents_files(torrent_hash)
+                file_paths = [os.path.join(save_path, tf.name) for tf in torrent_files]
 
             logger.info(f"  Found {len(file_paths)} files in torrent")
 
-            analysis = file_analyzer.detect_orphaned_files(file_paths)
+            analysis = file_analyzer.detect_orphaned_files(
+                file_paths, stat_cache=None if files_changed else path_stats
+            )
             orphaned_files = analysis.orphaned
             stats.orphaned_files_found += len(orphaned_files)
 
@@ -253,14 +422,20 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
                 if not config.dry_run:
                     logger.info(f"  Pausing torrent '{torrent_name}' during hardlink fix")
                     qbt_client.pause_torrent(torrent_hash)
+                try:
+                    fix_results = hardlink_fixer.fix_orphaned_files(
+                        orphaned_files,
+                        size_index,
+                        file_analyzer,
+                        dry_run=config.dry_run
+                    )
+                finally:
+                    # Resume torrent after fixing, even if the fix raised
+                    if not config.dry_run:
+                        logger.info(f"  Resuming torrent '{torrent_name}' after hardlink fix")
+                        qbt_client.resume_torrent(torrent_hash)
 
-                fix_results = hardlink_fixer.fix_orphaned_files(
-                    orphaned_files,
-                    size_index,
-                    file_analyzer,
-                    dry_run=config.dry_run
-                )
-
+                files_changed = files_changed or (fix_results.fixed > 0 and not config.dry_run)
                 stats.hardlinks_attempted += fix_results.attempted
                 stats.hardlinks_fixed += fix_results.fixed
                 stats.hardlinks_failed += fix_results.failed
@@ -279,11 +454,6 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
                             message=fix_result.result.message,
                         ))
 
-                # Resume torrent after fixing
-                if not config.dry_run:
-                    logger.info(f"  Resuming torrent '{torrent_name}' after hardlink fix")
-                    qbt_client.resume_torrent(torrent_hash)
-
             # --- Deletion decision ---
             if not deletion_check.should_delete:
                 if media_files_fixed > 0:
@@ -304,22 +474,20 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
                 stats.torrents_kept_hardlink_failures += 1
                 continue
 
-            # Check if files are already hardlinked to media library (only for deletion-eligible)
-            media_files_already_linked = 0
-            if analysis.linked:
-                # Files are hardlinked - verify they're linked to media library
-                for linked_file in analysis.linked:
-                    if not file_analyzer.is_media_file(linked_file):
-                        continue
-                    # Check if this file exists in media library
-                    if file_analyzer.find_identical_file(linked_file, size_index=size_index):
-                        media_files_already_linked += 1
-
-            if media_files_already_linked > 0 or media_files_fixed > 0:
-                logger.info(
-                    f"  Keeping torrent ({media_files_already_linked} media file(s) already hardlinked, "
-                    f"{media_files_fixed} media file(s) fixed)"
-                )
+            # Check if files are already hardlinked to media library (only for deletion-eligible).
+            # One match is enough to keep the torrent, so stop at the first.
+            if media_files_fixed > 0:
+                logger.info(f"  Keeping torrent ({media_files_fixed} media file(s) fixed)")
+                stats.torrents_kept += 1
+                stats.torrents_kept_hardlinks_fixed += 1
+                continue
+
+            if any(
+                file_analyzer.is_media_file(linked_file)
+                and is_in_media_library(file_analyzer, linked_file, size_index, library_matches)
+                for linked_file in analysis.linked
+            ):
+                logger.info("  Keeping torrent (media file(s) already hardlinked to media library)")
                 stats.torrents_kept += 1
                 stats.torrents_kept_hardlinks_fixed += 1
                 continue
@@ -334,6 +502,7 @@ def run_workflow(config: Config, qbt_client: QBittorrentClient, file_analyzer: F
             )
 
             if success:
+                files_changed = files_changed or not config.dry_run
                 stats.torrents_deleted += 1
                 stats.space_freed_criteria_bytes += freed
                 stats.deleted_torrents.append(torrent_name)
@@ -368,9 +537,10 @@ def main() -> int:
             logger.warning("Another instance is already running — skipping this run")
             if config.discord_webhook_url:
                 try:
-                    DiscordNotifier(config.discord_webhook_url).send_error(
-                        "Torrent Cleaner run skipped: another instance is already running"
-                    )
+                    with DiscordNotifier(config.discord_webhook_url) as notifier:
+                        notifier.send_error(
+                            "Torrent Cleaner run skipped: another instance is already running"
+                        )
                 except Exception as e:
                     logger.error(f"Failed to send Discord skip notification: {e}")
             lock_file.close()
@@ -408,10 +578,7 @@ def main() -> int:
         torrent_cleaner = TorrentCleaner(config, qbt_client)
         discord_notifier = DiscordNotifier(config.discord_webhook_url)
 
-        logger.info("Building media library size index...")
-        size_index = file_analyzer.build_size_index(config.media_library_dir)
-
-        stats = run_workflow(config, qbt_client, file_analyzer, hardlink_fixer, torrent_cleaner, size_index)
+        stats = run_workflow(config, qbt_client, file_analyzer, hardlink_fixer, torrent_cleaner)
 
         qbt_client.close()
 
@@ -450,8 +617,6 @@ def main() -> int:
 
         logger.info("=" * 80)
 
-        discord_notifier.send_summary(stats, config.dry_run)
-
         if stats.hardlink_failures:
             failure_log = config.data_dir / 'logs' / 'hardlink-failures.log'
             with open(failure_log, 'a') as f:
@@ -462,7 +627,9 @@ def main() -> int:
                     f.write(f"  Media: {failure.media_file}\n")
                     f.write(f"  Error: {failure.action.value} - {failure.message}\n")
             logger.warning(f"Hardlink failures written to {failure_log}")
-            discord_notifier.send_hardlink_failures(stats.hardlink_failures)
+
+        discord_notifier.send_run_report(stats, config.dry_run)
+        discord_notifier.close()
 
         if file_cache:
             file_cache.close()
@@ -477,7 +644,8 @@ def main() -> int:
         try:
             webhook_url = os.getenv('DISCORD_WEBHOOK_URL', '')
             if webhook_url:
-                DiscordNotifier(webhook_url).send_error(f"Fatal error: {e}")
+                with DiscordNotifier(webhook_url) as notifier:
+                    notifier.send_error(f"Fatal error: {e}")
         except Exception as discord_error:
             logger.error(f"Failed to send Discord error notification: {discord_error}")
 
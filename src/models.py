@@ -1,24 +1,48 @@
 """Data models for torrent cleaner application."""
 
 from dataclasses import dataclass, field
+from datetime import timedelta
 from enum import Enum
-from typing import Dict, List, Optional, ValuesView
+from typing import Dict, List, Optional, Set, Tuple, ValuesView
 
 
-@dataclass
+@dataclass(slots=True)
 class DeletionRule:
     """A single deletion rule with optional duration and ratio thresholds."""
     min_duration: Optional[str] = None   # raw string like "30d"
     min_ratio: Optional[float] = None
-
-
-@dataclass
+    # Parsed min_duration, filled in by Config so it isn't re-parsed per torrent
+    min_duration_delta: Optional[timedelta] = field(default=None, compare=False, repr=False)
+    # Display label, filled in by Config so it isn't rebuilt per torrent
+    label: Optional[str] = field(default=None, compare=False, repr=False)
+
+    def format_label(self) -> str:
+        """Format the rule's conditions for display, e.g. '30d AND 2.0'."""
+        parts = []
+        if self.min_duration is not None:
+            parts.append(self.min_duration)
+        if self.min_ratio is not None:
+            parts.append(str(self.min_ratio))
+        return ' AND '.join(parts)
+
+
+@dataclass(slots=True)
 class SizeIndex:
     """Index mapping file sizes to lists of file paths."""
     _entries: Dict[int, List[str]] = field(default_factory=dict)
+    # (st_dev, st_ino) of indexed files, for hardlink checks without stat'ing candidates
+    _inodes: Set[Tuple[int, int]] = field(default_factory=set)
+    # Total paths across all sizes, kept in step with add() so file_count needn't scan
+    _count: int = 0
 
-    def add(self, size: int, path: str) -> None:
+    def add(self, size: int, path: str, inode: Optional[Tuple[int, int]] = None) -> None:
         self._entries.setdefault(size, []).append(path)
+        self._count += 1
+        if inode is not None:
+            self._inodes.add(inode)
+
+    def has_inode(self, dev: int, ino: int) -> bool:
+        return (dev, ino) in self._inodes
 
     def get_candidates(self, size: int) -> List[str]:
         return self._entries.get(size, [])
@@ -37,20 +61,20 @@ class SizeIndex:
 
     @property
     def file_count(self) -> int:
-        return sum(len(paths) for paths in self._entries.values())
+        return self._count
 
     def values(self) -> ValuesView:
         return self._entries.values()
 
 
-@dataclass
+@dataclass(slots=True)
 class FileCacheStats:
     """Statistics about the persistent file hash cache."""
     total_entries: int
     db_size_bytes: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheStats:
     """Statistics from file hash cache usage."""
     hits: int
@@ -58,7 +82,7 @@ class CacheStats:
     hit_rate: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TorrentStats:
     """Statistics about a torrent's seeding status."""
     ratio: float
@@ -67,7 +91,7 @@ class TorrentStats:
     age_days: Optional[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class DeletionDecision:
     """Decision about whether to delete a torrent."""
     should_delete: bool
@@ -82,9 +106,8 @@ class HardlinkAction(Enum):
     VALIDATION_FAILED = 'validation_failed'
     SIZE_MISMATCH = 'size_mismatch'
     STAT_FAILED = 'stat_failed'
-    BACKUP_FAILED = 'backup_failed'
-    LINK_FAILED_RESTORED = 'link_failed_restored'
-    LINK_FAILED_RESTORE_FAILED = 'link_failed_restore_failed'
+    # The orphaned file is never moved, so a failed link or replace leaves it untouched
+    LINK_FAILED = 'link_failed'
 
     @property
     def is_actionable_failure(self) -> bool:
@@ -92,13 +115,11 @@ class HardlinkAction(Enum):
 
 
 _ACTIONABLE_FAILURES = {
-    HardlinkAction.LINK_FAILED_RESTORED,
-    HardlinkAction.LINK_FAILED_RESTORE_FAILED,
-    HardlinkAction.BACKUP_FAILED,
+    HardlinkAction.LINK_FAILED,
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class HardlinkResult:
     """Result of attempting to fix a single hardlink."""
     success: bool
@@ -106,7 +127,7 @@ class HardlinkResult:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class HardlinkFixResult:
     """Result of fixing a single orphaned file."""
     file: str
@@ -114,7 +135,7 @@ class HardlinkFixResult:
     result: HardlinkResult
 
 
-@dataclass
+@dataclass(slots=True)
 class HardlinkBatchResult:
     """Result of fixing multiple orphaned files."""
     attempted: int
@@ -125,7 +146,7 @@ class HardlinkBatchResult:
     results: List[HardlinkFixResult]
 
 
-@dataclass
+@dataclass(slots=True)
 class OrphanDetectionStats:
     """Statistics from orphaned file detection."""
     total: int
@@ -134,7 +155,7 @@ class OrphanDetectionStats:
     errors: int
 
 
-@dataclass
+@dataclass(slots=True)
 class OrphanDetectionResult:
     """Result of detecting orphaned files."""
     orphaned: List[str]
@@ -142,7 +163,7 @@ class OrphanDetectionResult:
     stats: OrphanDetectionStats
 
 
-@dataclass
+@dataclass(slots=True)
 class HardlinkFailure:
     """An actionable hardlink failure requiring manual intervention."""
     torrent: str
@@ -152,7 +173,7 @@ class HardlinkFailure:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowStats:
     """Statistics from the torrent cleaning workflow."""
     torrents_processed: int = 0
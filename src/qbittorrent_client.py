@@ -3,11 +3,20 @@
 import qbittorrentapi
 from qbittorrentapi import Client
 import logging
+from typing import List
 
 
 class QBittorrentClient:
     """Wrapper for qBittorrent Web API client."""
 
+    # Keep-alive connections held by the underlying requests session; sized so
+    # concurrent callers (e.g. parallel torrents_files fetches) reuse connections
+    # instead of opening and discarding one per request past the default of 10
+    POOL_MAXSIZE = 16
+
+    # Hashes per bulk delete request; keeps the form body/URL length bounded
+    DELETE_BATCH_SIZE = 500
+
     def __init__(self, host: str, port: int, username: str, password: str):
         """
         Initialize qBittorrent client.
@@ -28,6 +37,7 @@ class QBittorrentClient:
                 port=port,
                 username=username,
                 password=password,
+                HTTPADAPTER_ARGS={'pool_connections': 1, 'pool_maxsize': self.POOL_MAXSIZE},
             )
             self.client.auth_log_in()
             self.logger.info(f"Successfully connected to qBittorrent at {host}:{port}")
@@ -65,6 +75,36 @@ class QBittorrentClient:
             self.logger.error(f"Failed to delete torrent {torrent_hash}: {e}")
             return False
 
+    def delete_torrents(self, torrent_hashes: List[str], delete_files: bool = True, dry_run: bool = True) -> List[str]:
+        """
+        Delete several torrents, batching hashes into as few API calls as possible.
+
+        Args:
+            torrent_hashes: Torrent hashes
+            delete_files: Whether to delete files from disk
+            dry_run: If True, don't actually delete
+
+        Returns:
+            Hashes that were deleted (or would be, in dry_run); a failed batch is left out
+        """
+        if dry_run:
+            self.logger.info(f"[DRY RUN] Would delete {len(torrent_hashes)} torrents (delete_files={delete_files})")
+            return list(torrent_hashes)
+
+        deleted = []
+        for start in range(0, len(torrent_hashes), self.DELETE_BATCH_SIZE):
+            batch = torrent_hashes[start:start + self.DELETE_BATCH_SIZE]
+            try:
+                self.client.torrents_delete(
+                    torrent_hashes=batch,
+                    delete_files=delete_files
+                )
+                self.logger.info(f"Deleted {len(batch)} torrents (delete_files={delete_files})")
+                deleted.extend(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to delete {len(batch)} torrents: {e}")
+        return deleted
+
     def pause_torrent(self, torrent_hash: str):
         """
         Pause a torrent.
@@ -74,7 +114,7 @@ class QBittorrentClient:
         """
         try:
             self.client.torrents_pause(torrent_hashes=torrent_hash)
-            self.logger.debug(f"Paused torrent: {torrent_hash}")
+            self.logger.debug("Paused torrent: %s", torrent_hash)
         except Exception as e:
             self.logger.error(f"Failed to pause torrent {torrent_hash}: {e}")
             raise
@@ -88,7 +128,7 @@ class QBittorrentClient:
         """
         try:
             self.client.torrents_resume(torrent_hashes=torrent_hash)
-            self.logger.debug(f"Resumed torrent: {torrent_hash}")
+            self.logger.debug("Resumed torrent: %s", torrent_hash)
         except Exception as e:
             self.logger.error(f"Failed to resume torrent {torrent_hash}: {e}")
             raise
@@ -116,7 +156,7 @@ class QBittorrentClient:
         """
         try:
             torrents = self.client.torrents_info(**kwargs)
-            self.logger.debug(f"Retrieved {len(torrents)} torrents from qBittorrent")
+            self.logger.debug("Retrieved %s torrents from qBittorrent", len(torrents))
             return torrents
         except Exception as e:
             self.logger.error(f"Failed to get torrents: {e}")
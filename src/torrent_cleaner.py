@@ -1,7 +1,9 @@
 """Torrent deletion logic with age and ratio filtering."""
 
 from datetime import timedelta
+import functools
 import logging
+from typing import List, Set
 import qbittorrentapi
 
 from src.config import Config
@@ -9,6 +11,21 @@ from src.models import DeletionDecision, DeletionRule, TorrentStats
 from src.qbittorrent_client import QBittorrentClient
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_seconds(total_seconds: int) -> str:
+    """Format a duration in whole seconds; memoized since grouped torrents share seeding times."""
+    days, remainder = divmod(total_seconds, 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
+
+    if days > 0:
+        # Only show minutes if less than a day
+        return f"{days}d {hours}h" if hours > 0 else f"{days}d"
+    if hours > 0:
+        return f"{hours}h {minutes}m" if minutes > 0 else f"{hours}h"
+    return f"{minutes}m"
+
+
 class TorrentCleaner:
     """Handle torrent deletion with age and ratio criteria."""
 
@@ -58,6 +75,8 @@ class TorrentCleaner:
             )
 
         age = timedelta(seconds=seeding_time)
+        # Formatted once; every duration rule quotes it
+        age_text = _format_seconds(int(seeding_time))
         reasons = []
         should_delete = False
 
@@ -66,12 +85,14 @@ class TorrentCleaner:
             rule_reasons = []
 
             if rule.min_duration is not None:
-                min_duration = self.config.parse_duration(rule.min_duration)
+                min_duration = rule.min_duration_delta
+                if min_duration is None:
+                    min_duration = self.config.parse_duration(rule.min_duration)
                 if age < min_duration:
                     rule_passed = False
-                    rule_reasons.append(f"age {self._format_timedelta(age)} < {rule.min_duration}")
+                    rule_reasons.append(f"age {age_text} < {rule.min_duration}")
                 else:
-                    rule_reasons.append(f"age {self._format_timedelta(age)} >= {rule.min_duration}")
+                    rule_reasons.append(f"age {age_text} >= {rule.min_duration}")
 
             if rule.min_ratio is not None:
                 if ratio < rule.min_ratio:
@@ -80,7 +101,9 @@ class TorrentCleaner:
                 else:
                     rule_reasons.append(f"ratio {ratio:.2f} >= {rule.min_ratio}")
 
-            rule_label = self._format_rule(rule)
+            rule_label = rule.label
+            if rule_label is None:
+                rule_label = self._format_rule(rule)
             if rule_passed:
                 reasons.append(f"Rule [{rule_label}]: PASS ({', '.join(rule_reasons)})")
                 should_delete = True
@@ -94,7 +117,7 @@ class TorrentCleaner:
             stats=TorrentStats(
                 ratio=ratio,
                 seeding_time_seconds=seeding_time,
-                age=self._format_timedelta(age),
+                age=age_text,
                 age_days=age.days
             )
         )
@@ -102,12 +125,7 @@ class TorrentCleaner:
     @staticmethod
     def _format_rule(rule: DeletionRule) -> str:
         """Format a deletion rule for display in reason strings."""
-        parts = []
-        if rule.min_duration is not None:
-            parts.append(rule.min_duration)
-        if rule.min_ratio is not None:
-            parts.append(str(rule.min_ratio))
-        return ' AND '.join(parts)
+        return rule.format_label()
 
     def delete_torrent(self, torrent_hash: str, torrent_name: str, delete_files: bool = True) -> bool:
         """
@@ -141,28 +159,34 @@ class TorrentCleaner:
 
         return success
 
-    @staticmethod
-    def _format_timedelta(td: timedelta) -> str:
+    def delete_torrents(self, torrents: List[qbittorrentapi.TorrentDictionary], delete_files: bool = True) -> Set[str]:
         """
-        Format timedelta for human-readable display.
+        Delete several torrents from qBittorrent in bulk.
 
         Args:
-            td: timedelta object
+            torrents: Torrents to delete
+            delete_files: Whether to delete files from disk
 
         Returns:
-            Formatted string like "30d 5h" or "2d 3h 15m"
+            Set of hashes that were deleted
         """
-        days = td.days
-        seconds = td.seconds
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-
-        parts = []
-        if days > 0:
-            parts.append(f"{days}d")
-        if hours > 0:
-            parts.append(f"{hours}h")
-        if minutes > 0 and days == 0:  # Only show minutes if less than a day
-            parts.append(f"{minutes}m")
-
-        return ' '.join(parts) if parts else '0m'
+        for torrent in torrents:
+            self.logger.info(
+                f"Deleting torrent: {torrent.name} (hash={torrent.hash}, delete_files={delete_files})"
+            )
+
+        deleted = set(self.qbt_client.delete_torrents(
+            [torrent.hash for torrent in torrents],
+            delete_files=delete_files,
+            dry_run=self.config.dry_run
+        ))
+
+        for torrent in torrents:
+            if torrent.hash not in deleted:
+                self.logger.error(f"Failed to delete torrent: {torrent.name}")
+            elif self.config.dry_run:
+                self.logger.info(f"[DRY RUN] Would have deleted torrent: {torrent.name}")
+            else:
+                self.logger.info(f"Successfully deleted torrent: {torrent.name}")
+
+        return deleted
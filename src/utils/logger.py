@@ -1,10 +1,31 @@
 """Logging configuration for torrent cleaner."""
 
+import atexit
 import logging
+import os
+import queue
 import sys
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+# Background thread that owns the real (console/file) handlers
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and close the handlers of the running listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def _rotate_log_file(log_file: str, max_files: int) -> None:
     """Rotate existing log file by renaming it with a timestamp suffix.
@@ -15,10 +36,14 @@ def _rotate_log_file(log_file: str, max_files: int) -> None:
     When *max_files* is 0, no files are deleted.
     """
     path = Path(log_file)
-    if not path.exists() or path.stat().st_size == 0:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return
+    if st.st_size == 0:
         return
 
-    mtime = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+    mtime = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
     timestamp = mtime.strftime("%Y%m%d-%H%M%S")
     rotated = path.with_name(f"{path.stem}-{timestamp}{path.suffix}")
     path.rename(rotated)
@@ -26,10 +51,17 @@ def _rotate_log_file(log_file: str, max_files: int) -> None:
     if max_files <= 0:
         return
 
-    pattern = f"{path.stem}-*{path.suffix}"
-    rotated_files = sorted(path.parent.glob(pattern))
-    while len(rotated_files) > max_files:
-        rotated_files.pop(0).unlink()
+    # Names of the form {stem}-*{suffix}; the timestamp makes name order chronological
+    prefix = f"{path.stem}-"
+    suffix = path.suffix
+    with os.scandir(path.parent) as entries:
+        rotated_files = sorted(
+            entry.path for entry in entries
+            if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+            and len(entry.name) >= len(prefix) + len(suffix)
+        )
+    for old_file in rotated_files[:-max_files]:
+        os.unlink(old_file)
 
 
 def setup_logger(
@@ -41,6 +73,10 @@ def setup_logger(
     """
     Configure and return a logger instance.
 
+    Records are put on a queue and written to the console and log file by a
+    background listener thread, so logging calls never block on I/O. Queued
+    records are flushed when the logger is reconfigured and at exit.
+
     Args:
         name: Logger name
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -50,10 +86,12 @@ def setup_logger(
     Returns:
         Configured logger instance
     """
+    global _listener
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, log_level.upper()))
 
     logger.handlers.clear()
+    _stop_listener()
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
@@ -62,7 +100,7 @@ def setup_logger(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     if log_file:
         log_path = Path(log_file)
@@ -77,6 +115,11 @@ def setup_logger(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     return logger
@@ -70,14 +70,14 @@ def test_fix_with_rollback(qb_client, torrent_creator, test_dirs):
         )
 
     assert not result.success, "Fix should fail"
-    assert result.action == HardlinkAction.LINK_FAILED_RESTORED
+    assert result.action == HardlinkAction.LINK_FAILED
     assert "Simulated hardlink failure" in result.message
 
-    assert torrent_data['file'].exists(), "Original file should be restored"
+    assert torrent_data['file'].exists(), "Original file should be untouched"
     assert torrent_data['file'].read_bytes() == original_content, "Content should be unchanged"
 
-    backup_path = torrent_data['file'].with_suffix(torrent_data['file'].suffix + '.bak')
-    assert not backup_path.exists(), "Backup should be cleaned up"
+    temp_links = list(torrent_data['file'].parent.glob(torrent_data['file'].name + '.*.newlink'))
+    assert temp_links == [], "Temporary hardlink should be cleaned up"
 
 
 def test_size_mismatch_no_hardlink(qb_client, torrent_creator, test_dirs):
@@ -3,7 +3,7 @@
 import pytest
 import os
 from datetime import timedelta
-from src.config import Config
+from src.config import Config, _parse_duration_cached
 from src.models import DeletionRule
 
 
@@ -76,6 +76,21 @@ class TestParseDuration:
         assert Config.parse_duration('0m') == timedelta(days=0)
         assert Config.parse_duration('0y') == timedelta(days=0)
 
+    def test_parse_signed_value(self):
+        """Test that an explicit sign is accepted, as int() accepts it."""
+        assert Config.parse_duration('+30d') == timedelta(days=30)
+        assert Config.parse_duration('+1y') == timedelta(days=365)
+        assert Config.parse_duration('-0d') == timedelta(days=0)
+
+    def test_parse_is_memoized(self):
+        """Test that repeated durations are served from the cache."""
+        _parse_duration_cached.cache_clear()
+        assert Config.parse_duration('45d') == timedelta(days=45)
+        assert Config.parse_duration('45d') == timedelta(days=45)
+        info = _parse_duration_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
 
 class TestParseDeletionCriteria:
     """Test Config._parse_deletion_criteria() method."""
@@ -86,6 +101,8 @@ class TestParseDeletionCriteria:
         assert len(rules) == 1
         assert rules[0].min_duration == '30d'
         assert rules[0].min_ratio == 2.0
+        assert rules[0].min_duration_delta == timedelta(days=30)
+        assert rules[0].label == '30d AND 2.0'
 
     def test_single_rule_duration_only(self):
         """Test single rule with duration only."""
@@ -100,6 +117,8 @@ class TestParseDeletionCriteria:
         assert len(rules) == 1
         assert rules[0].min_duration is None
         assert rules[0].min_ratio == 0.5
+        assert rules[0].min_duration_delta is None
+        assert rules[0].label == '0.5'
 
     def test_multiple_rules(self):
         """Test multiple rules separated by pipe."""
@@ -227,3 +246,15 @@ class TestConfigValidation:
 
         with pytest.raises(ValueError, match="Cannot create data directory"):
             Config()
+
+    def test_missing_torrent_dir(self, tmp_path, monkeypatch):
+        """Test that a nonexistent TORRENT_DIR raises ValueError."""
+        monkeypatch.setenv('QBITTORRENT_HOST', 'localhost')
+        monkeypatch.setenv('QBITTORRENT_USERNAME', 'admin')
+        monkeypatch.setenv('QBITTORRENT_PASSWORD', 'admin')
+        monkeypatch.setenv('TORRENT_DIR', str(tmp_path / 'missing'))
+        monkeypatch.setenv('MEDIA_LIBRARY_DIR', str(tmp_path))
+        monkeypatch.setenv('DRY_RUN', 'false')
+
+        with pytest.raises(ValueError, match="Torrent directory does not exist"):
+            Config()
@@ -0,0 +1,59 @@
+"""Unit tests for find_dead_tracker_torrents."""
+
+from types import SimpleNamespace
+
+from src.main import find_dead_tracker_torrents
+
+
+class FakeClient:
+    """Stands in for QBittorrentClient, returning canned trackers per hash."""
+
+    def __init__(self, trackers_by_hash):
+        self.trackers_by_hash = trackers_by_hash
+        self.queried = []
+
+    def torrents_trackers(self, torrent_hash):
+        self.queried.append(torrent_hash)
+        return self.trackers_by_hash[torrent_hash]
+
+
+def _torrent(torrent_hash, tracker=''):
+    return SimpleNamespace(hash=torrent_hash, name=torrent_hash, tracker=tracker)
+
+
+def _tracker(status, msg='', url='http://tracker.example/announce'):
+    return SimpleNamespace(url=url, status=status, msg=msg)
+
+
+class TestFindDeadTrackerTorrents:
+
+    def test_last_working_tracker_still_checked(self):
+        """A torrent whose 'tracker' still names the last working tracker is checked and found dead."""
+        client = FakeClient({'a': [_tracker(4, 'Unregistered torrent')]})
+        torrents = [_torrent('a', tracker='http://tracker.example/announce')]
+
+        dead = find_dead_tracker_torrents(client, torrents, ['unregistered torrent'])
+
+        assert [t.hash for t in dead] == ['a']
+        assert client.queried == ['a']
+
+    def test_keeps_order_and_skips_working(self):
+        """Only torrents whose real trackers are all dead are returned, in input order."""
+        client = FakeClient({
+            'a': [_tracker(4, 'Unregistered torrent')],
+            'b': [_tracker(2)],
+            # DHT pseudo-tracker is ignored
+            'c': [_tracker(4, 'unregistered torrent'), _tracker(2, url='** [DHT] **')],
+        })
+        torrents = [_torrent('a'), _torrent('b'), _torrent('c')]
+
+        dead = find_dead_tracker_torrents(client, torrents, ['Unregistered torrent'])
+
+        assert [t.hash for t in dead] == ['a', 'c']
+
+    def test_no_messages_queries_nothing(self):
+        """With no dead messages configured no tracker can match, so nothing is queried."""
+        client = FakeClient({'a': [_tracker(4, 'Unregistered torrent')]})
+
+        assert find_dead_tracker_torrents(client, [_torrent('a')], []) == []
+        assert client.queried == []
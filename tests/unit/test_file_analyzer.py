@@ -53,6 +53,15 @@ class TestIsMediaFile:
         assert analyzer.is_media_file('/path/to/file') == False
         assert analyzer.is_media_file('movie') == False
 
+    def test_dotfile_is_not_media(self):
+        """Test that a name that is only an extension is a hidden file, as with Path.suffix."""
+        analyzer = FileAnalyzer()
+
+        assert analyzer.is_media_file('/path/to/.mkv') == False
+        assert analyzer.is_media_file('.mkv') == False
+        assert analyzer.is_media_file('/path/to/..mkv') == True
+        assert analyzer.is_media_file('/path.mkv/file') == False
+
     def test_custom_extensions(self):
         """Test custom media extensions passed via constructor."""
         analyzer = FileAnalyzer(media_extensions={'.mkv', '.srt'})
@@ -98,6 +107,7 @@ class TestBuildSizeIndex:
             size = len(content)
             assert size in index
             assert len(index[size]) == 2
+            assert index.file_count == 2
 
     def test_different_sizes(self):
         """Test files with different sizes are separate."""
@@ -113,6 +123,7 @@ class TestBuildSizeIndex:
             index = analyzer.build_size_index(media_dir)
 
             assert len(index) == 2
+            assert index.file_count == 2
 
     def test_nested_directories(self):
         """Test indexing files in nested directories."""
@@ -149,6 +160,22 @@ class TestBuildSizeIndex:
             assert any(str(mkv) in paths for paths in index.values())
             assert not any(str(srt) in paths for paths in index.values())
 
+    def test_size_filter(self):
+        """Test size index only keeps requested sizes."""
+        analyzer = FileAnalyzer()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            media_dir = Path(tmpdir)
+            wanted = media_dir / 'wanted.mkv'
+            other = media_dir / 'other.mkv'
+            wanted.write_bytes(b'x' * 10)
+            other.write_bytes(b'x' * 20)
+
+            index = analyzer.build_size_index(media_dir, sizes={10})
+
+            assert index.get_candidates(10) == [str(wanted)]
+            assert 20 not in index
+
     def test_empty_directory(self):
         """Test size index of empty directory."""
         analyzer = FileAnalyzer()
@@ -182,6 +209,42 @@ class TestBuildSizeIndex:
             assert total_files == 1
 
 
+class TestDetectOrphanedFiles:
+    """Test detect_orphaned_files() method."""
+
+    def test_orphaned_and_linked(self):
+        """Test that link count splits files into orphaned and linked."""
+        analyzer = FileAnalyzer()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            orphan = Path(tmpdir) / 'orphan.mkv'
+            linked = Path(tmpdir) / 'linked.mkv'
+            orphan.write_bytes(b'orphan')
+            linked.write_bytes(b'linked')
+            os.link(linked, Path(tmpdir) / 'other.mkv')
+
+            result = analyzer.detect_orphaned_files([str(orphan), str(linked)])
+
+            assert result.orphaned == [str(orphan)]
+            assert result.linked == [str(linked)]
+
+    def test_uses_stat_cache(self):
+        """Test that cached stat results are used instead of stat'ing again."""
+        analyzer = FileAnalyzer()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            orphan = Path(tmpdir) / 'orphan.mkv'
+            orphan.write_bytes(b'orphan')
+            stat_cache = {str(orphan): os.stat(orphan), '/cached/missing.mkv': None}
+
+            # Removing the file shows the cached stat result is what gets used
+            orphan.unlink()
+            result = analyzer.detect_orphaned_files([str(orphan), '/cached/missing.mkv'], stat_cache=stat_cache)
+
+            assert result.orphaned == [str(orphan)]
+            assert result.stats.errors == 1
+
+
 class TestFindIdenticalFile:
     """Test find_identical_file() method."""
 
@@ -283,6 +346,65 @@ class TestFindIdenticalFile:
             assert result is None
 
 
+class TestFindIdenticalFiles:
+    """Test find_identical_files() batch method."""
+
+    def test_matches_orphans_sharing_size_bucket(self):
+        """Test that orphans with the same size are matched to the right candidates."""
+        analyzer = FileAnalyzer()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            media_dir = tmpdir / 'media'
+            media_dir.mkdir()
+            (media_dir / 'a.mkv').write_bytes(b'Content AAAA')
+            (media_dir / 'b.mkv').write_bytes(b'Content BBBB')
+
+            orphan_a = tmpdir / 'orphan_a.mkv'
+            orphan_a.write_bytes(b'Content AAAA')
+            orphan_b = tmpdir / 'orphan_b.mkv'
+            orphan_b.write_bytes(b'Content BBBB')
+            orphan_c = tmpdir / 'orphan_c.mkv'
+            orphan_c.write_bytes(b'Content CCCC')
+
+            size_index = analyzer.build_size_index(media_dir)
+            result = analyzer.find_identical_files(
+                [str(orphan_a), str(orphan_b), str(orphan_c)], size_index=size_index
+            )
+
+            assert result == {
+                str(orphan_a): str(media_dir / 'a.mkv'),
+                str(orphan_b): str(media_dir / 'b.mkv'),
+                str(orphan_c): None,
+            }
+
+    def test_hardlinked_candidate(self):
+        """Test that a candidate sharing the orphan's inode matches without hashing."""
+        analyzer = FileAnalyzer()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            media_file = tmpdir / 'movie.mkv'
+            media_file.write_bytes(b'Movie content')
+            linked_file = tmpdir / 'linked.mkv'
+            os.link(media_file, linked_file)
+
+            size_index = SizeIndex()
+            size_index.add(os.stat(media_file).st_size, str(media_file))
+
+            result = analyzer.find_identical_files([str(linked_file)], size_index=size_index)
+
+            assert result == {str(linked_file): str(media_file)}
+
+    def test_no_size_index_returns_none(self):
+        """Test that every orphan maps to None when no index is available."""
+        analyzer = FileAnalyzer()
+
+        result = analyzer.find_identical_files(['/path/a.mkv', '/path/b.mkv'])
+
+        assert result == {'/path/a.mkv': None, '/path/b.mkv': None}
+
+
 class TestFileAnalyzerWithCache:
     """Test FileAnalyzer with cache integration."""
 
@@ -360,3 +482,74 @@ class TestFileAnalyzerWithCache:
             assert stats.misses == 2
 
             cache.close()
+
+    def test_batch_hashes_each_file_once(self):
+        """Test that find_identical_files hashes shared candidates once, skips sample mismatches and uses the cache."""
+        from src.file_cache import FileCache
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            cache = FileCache(db_path=str(tmpdir / 'cache.db'))
+            analyzer = FileAnalyzer(cache=cache)
+
+            media_dir = tmpdir / 'media'
+            media_dir.mkdir()
+            (media_dir / 'a.mkv').write_bytes(b'Content AAAA')
+            (media_dir / 'b.mkv').write_bytes(b'Content BBBB')
+
+            orphans = []
+            for name, content in (('x.mkv', b'Content BBBB'), ('y.mkv', b'Content BBBB')):
+                orphan = tmpdir / name
+                orphan.write_bytes(content)
+                orphans.append(str(orphan))
+
+            size_index = analyzer.build_size_index(media_dir)
+
+            # 2 orphans + the shared matching candidate, each hashed once;
+            # a.mkv differs in its sample so it is never hashed
+            matches = analyzer.find_identical_files(orphans, size_index=size_index)
+            assert matches == dict.fromkeys(orphans, str(media_dir / 'b.mkv'))
+            stats = analyzer.get_cache_stats()
+            assert stats.misses == 3
+            assert stats.hits == 0
+
+            analyzer.find_identical_files(orphans, size_index=size_index)
+            stats = analyzer.get_cache_stats()
+            assert stats.hits == 3
+            assert stats.misses == 3
+
+            cache.close()
+
+    def test_warm_cache_skips_sampling(self, monkeypatch):
+        """Test that files with a cached hash are compared by hash, not re-read for a sample."""
+        from src import file_analyzer as file_analyzer_module
+        from src.file_cache import FileCache
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            cache = FileCache(db_path=str(tmpdir / 'cache.db'))
+            analyzer = FileAnalyzer(cache=cache)
+
+            media_dir = tmpdir / 'media'
+            media_dir.mkdir()
+            (media_dir / 'movie.mkv').write_bytes(b'Movie content')
+            orphan = tmpdir / 'orphan.mkv'
+            orphan.write_bytes(b'Movie content')
+
+            size_index = analyzer.build_size_index(media_dir)
+            analyzer.find_identical_file(str(orphan), size_index=size_index)
+
+            sampled = []
+            real_hash_sample = file_analyzer_module.hash_sample
+            monkeypatch.setattr(
+                file_analyzer_module, 'hash_sample',
+                lambda path, size: sampled.append(path) or real_hash_sample(path, size),
+            )
+
+            assert analyzer.find_identical_file(str(orphan), size_index=size_index) == str(media_dir / 'movie.mkv')
+            assert analyzer.find_identical_files([str(orphan)], size_index=size_index) == {
+                str(orphan): str(media_dir / 'movie.mkv')
+            }
+            assert sampled == []
+
+            cache.close()
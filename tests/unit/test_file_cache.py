@@ -5,7 +5,7 @@ import os
 import time
 import tempfile
 from pathlib import Path
-from src.file_cache import FileCache
+from src.file_cache import FileCache, db
 
 
 @pytest.fixture
@@ -106,6 +106,53 @@ class TestFileCache:
         stats = cache.get_stats()
         assert stats.total_entries == 1
 
+    def test_batch_store_and_retrieve(self, cache, cache_dir, sample_file):
+        """Test batched store and lookup, including invalidated and missing files."""
+        paths = []
+        for i in range(3):
+            path = os.path.join(cache_dir, f'batch{i}.bin')
+            with open(path, 'wb') as f:
+                f.write(b'x' * i)
+            paths.append(path)
+
+        cache.store_hashes({path: f'hash{i}' for i, path in enumerate(paths)})
+        assert cache.get_stats().total_entries == 3
+
+        # Change one file's size so its entry is no longer valid
+        with open(paths[1], 'ab') as f:
+            f.write(b'changed')
+
+        result = cache.get_cached_hashes(paths + [sample_file, '/nonexistent/file.bin'])
+        assert result == {paths[0]: 'hash0', paths[2]: 'hash2'}
+
+    def test_entries_dropped_on_version_change(self, cache_dir, sample_file):
+        """Test that reopening a cache written by another hash version clears it."""
+        db_path = os.path.join(cache_dir, 'versioned_cache.db')
+        fc = FileCache(db_path=db_path)
+        fc.store_hash(sample_file, 'oldhash')
+        db.execute_sql('PRAGMA user_version = 0')
+        fc.close()
+
+        fc = FileCache(db_path=db_path)
+        try:
+            assert fc.get_cached_hash(sample_file) is None
+            assert fc.get_stats().total_entries == 0
+        finally:
+            fc.close()
+
+    def test_entries_kept_on_reopen(self, cache_dir, sample_file):
+        """Test that reopening a cache with the current version keeps entries."""
+        db_path = os.path.join(cache_dir, 'reopen_cache.db')
+        fc = FileCache(db_path=db_path)
+        fc.store_hash(sample_file, 'abc123')
+        fc.close()
+
+        fc = FileCache(db_path=db_path)
+        try:
+            assert fc.get_cached_hash(sample_file) == 'abc123'
+        finally:
+            fc.close()
+
     def test_context_manager(self, cache_dir):
         """Test that __enter__ and __exit__ work correctly."""
         db_path = os.path.join(cache_dir, 'ctx_cache.db')
@@ -0,0 +1,71 @@
+"""Unit tests for HardlinkFixer.fix_hardlink."""
+
+import os
+import uuid
+
+from src import hardlink_fixer as hardlink_fixer_module
+from src.hardlink_fixer import HardlinkFixer
+from src.models import HardlinkAction
+
+
+def _make_pair(tmp_path):
+    """Create a media file and a same-sized, separate orphaned copy."""
+    media = tmp_path / "media" / "movie.mkv"
+    media.parent.mkdir()
+    media.write_bytes(b"M" * 4096)
+    orphan = tmp_path / "torrents" / "movie.mkv"
+    orphan.parent.mkdir()
+    orphan.write_bytes(b"T" * 4096)
+    return media, orphan
+
+
+class TestFixHardlink:
+
+    def test_fix_leaves_no_temp_link(self, tmp_path):
+        """A successful fix links the orphan to the media file and leaves nothing else behind."""
+        media, orphan = _make_pair(tmp_path)
+
+        result = HardlinkFixer().fix_hardlink(str(orphan), str(media), dry_run=False)
+
+        assert result.action == HardlinkAction.FIXED
+        assert os.stat(orphan).st_ino == os.stat(media).st_ino
+        assert sorted(p.name for p in orphan.parent.iterdir()) == ["movie.mkv"]
+
+    def test_replace_failure_removes_temp_link(self, tmp_path, monkeypatch):
+        """If the replace fails the orphan is untouched and the temporary link is removed."""
+        media, orphan = _make_pair(tmp_path)
+
+        def failing_replace(src, dst):
+            raise OSError("Simulated replace failure")
+
+        monkeypatch.setattr(hardlink_fixer_module.os, "replace", failing_replace)
+        result = HardlinkFixer().fix_hardlink(str(orphan), str(media), dry_run=False)
+
+        assert not result.success
+        assert result.action == HardlinkAction.LINK_FAILED
+        assert result.action.is_actionable_failure
+        assert "Simulated replace failure" in result.message
+        assert orphan.read_bytes() == b"T" * 4096
+        assert sorted(p.name for p in orphan.parent.iterdir()) == ["movie.mkv"]
+        assert os.stat(media).st_nlink == 1
+
+    def test_existing_temp_name_is_not_touched(self, tmp_path, monkeypatch):
+        """Files that already use a temporary link name are skipped, never unlinked."""
+        media, orphan = _make_pair(tmp_path)
+        taken = uuid.UUID("11111111-1111-4111-8111-111111111111")
+        fresh = uuid.UUID("22222222-2222-4222-8222-222222222222")
+        uuids = iter([taken, fresh])
+        monkeypatch.setattr(hardlink_fixer_module.uuid, "uuid4", lambda: next(uuids))
+
+        legacy = orphan.parent / "movie.mkv.newlink"
+        legacy.write_bytes(b"keep me")
+        collision = orphan.parent / f"movie.mkv.{taken.hex[:12]}.newlink"
+        collision.write_bytes(b"keep me too")
+
+        result = HardlinkFixer().fix_hardlink(str(orphan), str(media), dry_run=False)
+
+        assert result.action == HardlinkAction.FIXED
+        assert os.stat(orphan).st_ino == os.stat(media).st_ino
+        assert legacy.read_bytes() == b"keep me"
+        assert collision.read_bytes() == b"keep me too"
+        assert not (orphan.parent / f"movie.mkv.{fresh.hex[:12]}.newlink").exists()
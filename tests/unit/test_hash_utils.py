@@ -3,7 +3,7 @@
 import pytest
 import tempfile
 from pathlib import Path
-from src.utils.hash_utils import hash_file
+from src.utils.hash_utils import hash_file, hash_sample, read_sample
 
 
 class TestHashFile:
@@ -148,3 +148,51 @@ class TestHashFile:
         finally:
             file1.unlink()
             file2.unlink()
+
+
+class TestReadSample:
+    """Tests for read_sample function."""
+
+    def test_small_file_returned_whole(self):
+        """Test that files up to twice the sample size are read in full."""
+        content = b"0123456789"
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(content)
+            file_path = Path(f.name)
+
+        try:
+            assert read_sample(file_path, sample_size=5) == content
+        finally:
+            file_path.unlink()
+
+    def test_large_file_head_and_tail(self):
+        """Test that larger files return only the head and tail."""
+        content = b"HEAD" + b"x" * 100 + b"TAIL"
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(content)
+            file_path = Path(f.name)
+
+        try:
+            assert read_sample(file_path, sample_size=4) == b"HEADTAIL"
+        finally:
+            file_path.unlink()
+
+
+class TestHashSample:
+    """Tests for hash_sample function."""
+
+    def test_only_ends_are_sampled(self):
+        """Test that files differing only in the middle share a fingerprint."""
+        paths = []
+        for content in (b"HEAD" + b"a" * 100 + b"TAIL", b"HEAD" + b"b" * 100 + b"TAIL", b"XEAD" + b"a" * 100 + b"TAIL"):
+            with tempfile.NamedTemporaryFile(delete=False) as f:
+                f.write(content)
+                paths.append(Path(f.name))
+
+        try:
+            same_ends, other_middle, other_head = (hash_sample(p, sample_size=4) for p in paths)
+            assert same_ends == other_middle
+            assert same_ends != other_head
+        finally:
+            for p in paths:
+                p.unlink()
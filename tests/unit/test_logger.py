@@ -1,11 +1,12 @@
-"""Tests for log rotation in src/utils/logger.py."""
+"""Tests for log rotation and setup in src/utils/logger.py."""
 
+import logging
 import os
 from pathlib import Path
 
 import pytest
 
-from src.utils.logger import _rotate_log_file
+from src.utils.logger import _rotate_log_file, _stop_listener, setup_logger
 
 
 @pytest.fixture
@@ -87,3 +88,16 @@ class TestRotateLogFile:
         rotated = list(log_dir.glob("cleaner-*.log"))
         assert len(rotated) == 1
         assert expected_ts in rotated[0].name
+
+
+class TestSetupLogger:
+    def test_records_reach_log_file_after_stop(self, log_dir):
+        log_file = log_dir / "cleaner.log"
+        setup_logger("test", "DEBUG", str(log_file), max_files=0)
+        logging.getLogger("src.test").debug("queued record")
+
+        # Stopping the listener drains the queue into the file handler
+        _stop_listener()
+        logging.getLogger().handlers.clear()
+
+        assert "queued record" in log_file.read_text()
@@ -0,0 +1,69 @@
+"""Unit tests for is_in_media_library helper."""
+
+import os
+
+from src.main import is_in_media_library
+from src.models import SizeIndex
+
+
+class CountingAnalyzer:
+    """Stand-in FileAnalyzer that records find_identical_file calls."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def find_identical_file(self, file_path, size_index=None):
+        self.calls.append(file_path)
+        return self.result
+
+
+class TestIsInMediaLibrary:
+
+    def test_hardlinks_looked_up_once(self, tmp_path):
+        """Two links to the same inode share one lookup."""
+        f1 = tmp_path / "a.mkv"
+        f1.write_bytes(b"x" * 100)
+        f2 = tmp_path / "b.mkv"
+        os.link(f1, f2)
+
+        analyzer = CountingAnalyzer("/media/a.mkv")
+        memo = {}
+        assert is_in_media_library(analyzer, str(f1), SizeIndex(), memo)
+        assert is_in_media_library(analyzer, str(f2), SizeIndex(), memo)
+        assert analyzer.calls == [str(f1)]
+
+    def test_negative_result_memoized(self, tmp_path):
+        """A file with no library match is not looked up again."""
+        f = tmp_path / "a.mkv"
+        f.write_bytes(b"x" * 100)
+
+        analyzer = CountingAnalyzer(None)
+        memo = {}
+        assert not is_in_media_library(analyzer, str(f), SizeIndex(), memo)
+        assert not is_in_media_library(analyzer, str(f), SizeIndex(), memo)
+        assert len(analyzer.calls) == 1
+
+    def test_modified_file_looked_up_again(self, tmp_path):
+        """A size/mtime change invalidates the memo entry."""
+        f = tmp_path / "a.mkv"
+        f.write_bytes(b"x" * 100)
+
+        analyzer = CountingAnalyzer(None)
+        memo = {}
+        is_in_media_library(analyzer, str(f), SizeIndex(), memo)
+        f.write_bytes(b"x" * 200)
+        is_in_media_library(analyzer, str(f), SizeIndex(), memo)
+        assert len(analyzer.calls) == 2
+
+    def test_indexed_inode_skips_lookup(self, tmp_path):
+        """A hardlink to an indexed library file is found without a lookup."""
+        f = tmp_path / "a.mkv"
+        f.write_bytes(b"x" * 100)
+        st = os.stat(f)
+        size_index = SizeIndex()
+        size_index.add(st.st_size, "/media/a.mkv", (st.st_dev, st.st_ino))
+
+        analyzer = CountingAnalyzer(None)
+        assert is_in_media_library(analyzer, str(f), size_index, {})
+        assert analyzer.calls == []
@@ -110,3 +110,17 @@ class TestSpaceAccountant:
         sa = SpaceAccountant()
         freed = sa.estimate_freed([])
         assert freed == 0
+
+    def test_file_removed_mid_run_not_counted(self, tmp_path):
+        """A link removed after its inode was first tracked is skipped, not counted."""
+        f1 = tmp_path / "file.bin"
+        f1.write_bytes(b"x" * 700)
+        f2 = tmp_path / "link.bin"
+        os.link(f1, f2)
+
+        sa = SpaceAccountant()
+        assert sa.estimate_freed([str(f1)]) == 0
+
+        # f2 disappears before its torrent is processed
+        f2.unlink()
+        assert sa.estimate_freed([str(f2)]) == 0
@@ -0,0 +1,38 @@
+"""Unit tests for TorrentGroups class."""
+
+from src.main import TorrentGroups
+
+
+class TestTorrentGroups:
+
+    def test_unknown_hash_is_own_root(self):
+        """A hash never seen before forms a singleton group."""
+        groups = TorrentGroups()
+        assert groups.find("a") == "a"
+        assert groups.groups() == {"a": {"a"}}
+
+    def test_union_merges_groups(self):
+        """Two unions sharing a member end up in one group."""
+        groups = TorrentGroups()
+        groups.union("a", "b")
+        groups.union("c", "b")
+
+        assert groups.find("a") == groups.find("b") == groups.find("c")
+        assert list(groups.groups().values()) == [{"a", "b", "c"}]
+
+    def test_disjoint_groups_stay_separate(self):
+        """Unrelated pairs form separate groups."""
+        groups = TorrentGroups()
+        groups.union("a", "b")
+        groups.union("c", "d")
+
+        assert groups.find("a") != groups.find("c")
+        assert sorted(sorted(g) for g in groups.groups().values()) == [["a", "b"], ["c", "d"]]
+
+    def test_contains(self):
+        """Only hashes that were added are members."""
+        groups = TorrentGroups()
+        groups.union("a", "b")
+
+        assert "a" in groups
+        assert "z" not in groups